@@ -5,5 +5,8 @@ RLCE核心模块
 from .rlce import RLCE
 from .field_math import FieldMath
 from .cnf_converter import CNFConverter
+from .cnf_preprocessor import CNFPreprocessor
+from .gf2_solver import GF2Solver, SolverResult, verify_instance
 
-__all__ = ['RLCE', 'FieldMath', 'CNFConverter'] 
\ No newline at end of file
+__all__ = ['RLCE', 'FieldMath', 'CNFConverter', 'CNFPreprocessor', 'GF2Solver', 'SolverResult',
+           'verify_instance'] 
\ No newline at end of file
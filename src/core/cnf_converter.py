@@ -5,12 +5,42 @@ CNF转换器模块
 
 import numpy as np
 import os
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from .field_math import FieldMath
+from .cnf_preprocessor import CNFPreprocessor
+from .gf_circuits import (multiplication_matrix, field_system_matrix, reduction_matrix,
+                          eliminate_common_subexpressions)
+
+
+def matrix_to_csr(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    一次向量化遍历将稠密矩阵转换为CSR表示
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (indptr, indices)，第i行的非零列为indices[indptr[i]:indptr[i+1]]
+    """
+    matrix = np.asarray(matrix)
+    rows, cols = np.nonzero(matrix)
+    indptr = np.zeros(matrix.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=matrix.shape[0]), out=indptr[1:])
+    return indptr, cols.astype(np.int64)
+
+
+@lru_cache(maxsize=None)
+def _xor_sign_patterns(length: int, result: int) -> np.ndarray:
+    """
+    XOR的CNF子句符号模板：每个奇偶性与result不符的赋值对应一个子句，
+    赋值为1的变量取负文字
+    """
+    assignments = (np.arange(1 << length)[:, None] >> np.arange(length)) & 1
+    forbidden = assignments[assignments.sum(axis=1) % 2 != result]
+    return 1 - 2 * forbidden
 
 
 class CNFConverter:
-    def __init__(self, m: int, n: int, w: int, k: int, output_file: str = "output.cnf"):
+    def __init__(self, m: int, n: int, w: int, k: int, output_file: str = "output.cnf",
+                 preprocess: bool = False):
         """
         初始化CNF转换器
         
@@ -20,6 +50,7 @@ class CNFConverter:
             w (int): 插入列数
             k (int): 消息维度
             output_file (str): 输出文件名
+            preprocess (bool): 是否在输出前对子句进行预处理
         """
         self.m = m
         self.n = n
@@ -29,6 +60,18 @@ class CNFConverter:
         self.field_math = FieldMath(m)
         self.clause_count = 0
         self.variable_count = 0
+        self.preprocess = preprocess
+        self.preprocessor = None
+        # 预处理模式下子句先缓存在内存中
+        self.clauses: List[Tuple[int, ...]] = []
+        # 每个方程对应的XOR约束：(变量列表, 结果位)
+        self.xor_constraints: List[Tuple[List[int], int]] = []
+        # 变量分块：(类型, 起始编号, 个数)
+        self.variable_blocks: List[Tuple[str, int, int]] = []
+        # 增量模式：每个方程的右端选择变量，以及重量计数器的输出变量
+        self.row_selectors: List[int] = []
+        self.weight_outputs: List[int] = []
+        self.variant_count = 0
     
     def clear_output_file(self):
         """清空输出文件"""
@@ -37,10 +80,25 @@ class CNFConverter:
     
     def write_clause(self, clause: str):
         """写入一个子句到文件"""
+        if self.preprocess:
+            self.clauses.append(tuple(int(lit) for lit in clause.split()))
+            return
         with open(self.output_file, 'a') as f:
             f.write(f"{clause} 0\n")
         self.clause_count += 1
     
+    def write_clauses(self, clauses: np.ndarray):
+        """批量写入子句，每行为一个子句的文字"""
+        if len(clauses) == 0:
+            return
+        if self.preprocess:
+            self.clauses.extend(map(tuple, clauses.tolist()))
+            return
+        with open(self.output_file, 'a') as f:
+            np.savetxt(f, np.column_stack([clauses, np.zeros(len(clauses), dtype=np.int64)]),
+                       fmt='%d')
+        self.clause_count += len(clauses)
+    
     def number_to_binary(self, num: int, bits: int) -> np.ndarray:
         """将数字转换为指定位数的二进制表示"""
         binary = []
@@ -83,7 +141,7 @@ class CNFConverter:
                 ]
             else:
                 clauses = [
-                    f"{variables[0]} {variables[1]} {variables[2]}",
+                    f"{-variables[0]} {-variables[1]} {-variables[2]}",
                     f"{-variables[0]} {variables[1]} {variables[2]}",
                     f"{variables[0]} {-variables[1]} {variables[2]}",
                     f"{variables[0]} {variables[1]} {-variables[2]}"
@@ -127,35 +185,134 @@ class CNFConverter:
             matrix: 系数矩阵
             vector: 结果向量
         """
+        indptr, indices = matrix_to_csr(matrix)
+        self.convert_csr_to_cnf(indptr, indices, vector)
+    
+    def convert_csr_to_cnf(self, indptr: np.ndarray, indices: np.ndarray, vector: np.ndarray):
+        """
+        将CSR表示的稀疏矩阵方程转换为CNF格式
+        
+        Args:
+            indptr: 行指针数组，长度为行数+1
+            indices: 非零元素的列下标
+            vector: 结果向量
+        """
         self.clear_output_file()
+        self.clause_count = 0
+        self.clauses = []
         
-        # 计算变量总数
-        self.variable_count = self.m * (self.n + self.w)
+        # 为错误向量的每个比特分配变量
+        self.variable_count = 0
+        self.variable_blocks = []
+        self.allocate_variables('error', self.m * (self.n + self.w))
         
-        # 为每个方程生成CNF子句
-        for i in range(matrix.shape[0]):
-            row = matrix[i]
-            result_bit = vector[i] if i < len(vector) else 0
-            
-            # 获取非零元素的位置
-            non_zero_indices = np.nonzero(row)[0]
-            
-            if len(non_zero_indices) == 0:
+        indptr = np.asarray(indptr, dtype=np.int64)
+        variables = np.asarray(indices, dtype=np.int64) + 1
+        results = self._result_bits(vector, len(indptr) - 1)
+        
+        self.xor_constraints = [
+            (row.tolist(), int(result))
+            for row, result in zip(np.split(variables, indptr[1:-1]), results) if len(row)
+        ]
+        self._encode_rows(indptr, variables, results)
+        
+        if self.preprocess:
+            self._flush_preprocessed()
+    
+    @staticmethod
+    def _result_bits(vector: np.ndarray, num_rows: int) -> np.ndarray:
+        """每个方程的结果位，只有取值为1的项视为1"""
+        results = np.zeros(num_rows, dtype=np.int64)
+        size = min(num_rows, len(vector))
+        results[:size] = np.asarray(vector[:size]) == 1
+        return results
+    
+    def _encode_rows(self, indptr: np.ndarray, variables: np.ndarray, results: np.ndarray,
+                     extra: Optional[np.ndarray] = None):
+        """
+        按行重量分组，批量编码每组的XOR方程
+        
+        Args:
+            indptr: 行指针数组
+            variables: 各行的变量编号
+            results: 各行的结果位
+            extra: 每行额外追加的一个变量（可选）
+        """
+        weights = np.diff(indptr)
+        for weight in np.unique(weights):
+            rows = np.nonzero(weights == weight)[0]
+            block = variables[indptr[rows][:, None] + np.arange(weight)]
+            if extra is not None:
+                block = np.column_stack([block, extra[rows]])
+            if block.shape[1] == 0:
+                continue
+            self._encode_xor_block(block, results[rows])
+    
+    def _encode_xor_block(self, block: np.ndarray, results: np.ndarray):
+        """
+        批量编码相同长度的XOR方程，超过4个变量时使用辅助变量分解
+        
+        Args:
+            block: 形状为(方程数, 变量数)的变量编号矩阵
+            results: 各方程的结果位
+        """
+        num_rows = len(block)
+        # 每3个变量引入一个辅助变量记录其部分和: x1^x2^x3^a = 0
+        while block.shape[1] > 4:
+            aux = self.allocate_variables('auxiliary', num_rows) + np.arange(num_rows)
+            self._write_xor_block(np.column_stack([block[:, :3], aux]),
+                                  np.zeros(num_rows, dtype=np.int64))
+            block = np.column_stack([aux, block[:, 3:]])
+        self._write_xor_block(block, results)
+    
+    def _write_xor_block(self, block: np.ndarray, results: np.ndarray):
+        """将不超过4个变量的XOR方程按符号模板展开为子句"""
+        length = block.shape[1]
+        for result in (0, 1):
+            selected = block[results == result]
+            if len(selected) == 0:
                 continue
+            signs = _xor_sign_patterns(length, result)
+            clauses = selected[:, None, :] * signs[None, :, :]
+            self.write_clauses(clauses.reshape(-1, length))
+    
+    def _flush_preprocessed(self):
+        """对缓存的子句进行预处理并写入文件"""
+        self.preprocessor = CNFPreprocessor(self.variable_count)
+        clauses = self.preprocessor.process(self.clauses)
+        self.clauses = []
+        self.variable_count = self.preprocessor.new_variable_count
+        
+        with open(self.output_file, 'w') as f:
+            for clause in clauses:
+                f.write(" ".join(str(lit) for lit in clause + (0,)) + "\n")
+        self.clause_count = len(clauses)
+    
+    def allocate_variables(self, kind: str, count: int) -> int:
+        """
+        分配一段连续的新变量
+        
+        Args:
+            kind (str): 变量类型，如'auxiliary'、'cardinality'、'symbol'
+            count (int): 变量个数
             
-            if len(non_zero_indices) <= 4:
-                # 直接处理小型XOR
-                variables = [int(idx + 1) for idx in non_zero_indices]
-                self.generate_xor_cnf(variables, result_bit)
-            else:
-                # 使用辅助变量处理大型XOR
-                self._handle_large_xor(non_zero_indices, result_bit)
+        Returns:
+            int: 第一个变量的编号
+        """
+        start = self.variable_count + 1
+        if self.variable_blocks and self.variable_blocks[-1][0] == kind:
+            # 与上一段同类型时合并
+            last_kind, last_start, last_count = self.variable_blocks[-1]
+            self.variable_blocks[-1] = (kind, last_start, last_count + count)
+        else:
+            self.variable_blocks.append((kind, start, count))
+        self.variable_count += count
+        return start
     
     def _handle_large_xor(self, indices: np.ndarray, result: int):
         """处理大型XOR操作，使用辅助变量分解"""
-        # 实现大型XOR的分解逻辑
-        # 这里可以进一步优化
-        pass
+        self._encode_xor_block(np.asarray(indices, dtype=np.int64)[None, :] + 1,
+                               np.array([result]))
     
     def write_cnf_header(self):
         """写入CNF文件头"""
@@ -170,4 +327,223 @@ class CNFConverter:
         
         # 写入头部和内容
         with open(self.output_file, 'w') as f:
-            f.write(header + content) 
\ No newline at end of file
+            f.write(header + content) 
+    
+    def convert_matrix_to_icnf(self, matrix: np.ndarray, max_weight: int = None):
+        """
+        将矩阵方程转换为增量CNF（iCNF）格式
+        只写入与公钥相关的子句，方程右端和重量上界通过选择变量在各变体的假设行中给出
+        
+        Args:
+            matrix: 系数矩阵
+            max_weight (int): 变体可使用的最大重量上界，为None时不编码重量约束
+        """
+        if self.preprocess:
+            raise ValueError("增量模式不支持子句预处理")
+        
+        with open(self.output_file, 'w') as f:
+            f.write("p inccnf\n")
+        self.clause_count = 0
+        self.xor_constraints = []
+        self.variant_count = 0
+        
+        self.variable_count = 0
+        self.variable_blocks = []
+        self.allocate_variables('error', self.m * (self.n + self.w))
+        
+        # 方程 x1^...^xl = r 改写为 x1^...^xl^s = 0，由假设给出选择变量s的取值
+        indptr, indices = matrix_to_csr(matrix)
+        num_rows = len(indptr) - 1
+        first = self.allocate_variables('selector', num_rows)
+        selectors = first + np.arange(num_rows)
+        self.row_selectors = selectors.tolist()
+        self._encode_rows(indptr, indices + 1, np.zeros(num_rows, dtype=np.int64), extra=selectors)
+        
+        self.weight_outputs = []
+        if max_weight is not None:
+            # 重量按方程实际使用的列变量计数，每列一个位置
+            positions = (np.arange(np.asarray(matrix).shape[1]) + 1)[:, None]
+            self._encode_weight_counter(max_weight, positions)
+    
+    def _encode_weight_counter(self, max_weight: int, positions: np.ndarray):
+        """
+        用顺序计数器编码错误向量的重量（非零位置数）
+        weight_outputs[c-1]为真表示至少有c个非零位置，c = 1..max_weight+1
+        
+        Args:
+            max_weight (int): 需要区分的最大重量
+            positions: 形状为(位置数, 每个位置的比特数)的变量编号矩阵
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        length = len(positions)
+        bound = max_weight + 1
+        
+        if positions.shape[1] == 1:
+            indicators = positions[:, 0]
+        else:
+            # 位置非零指示变量：任一比特为1时指示变量为1
+            indicators = self.allocate_variables('cardinality', length) + np.arange(length)
+            self.write_clauses(np.column_stack([-positions.reshape(-1),
+                                                np.repeat(indicators, positions.shape[1])]))
+        
+        counters = self.allocate_variables('cardinality', length * bound)
+        s = lambda j, c: counters + j * bound + (c - 1)
+        for j in range(length):
+            z = int(indicators[j])
+            self.write_clause(f"{-z} {s(j, 1)}")
+            if j == 0:
+                continue
+            for c in range(1, bound + 1):
+                self.write_clause(f"{-s(j - 1, c)} {s(j, c)}")
+                if c > 1:
+                    self.write_clause(f"{-z} {-s(j - 1, c - 1)} {s(j, c)}")
+        self.weight_outputs = [s(length - 1, c) for c in range(1, bound + 1)]
+    
+    def add_variant(self, vector: np.ndarray, weight_bound: int = None) -> List[int]:
+        """
+        追加一个变体的假设行
+        
+        Args:
+            vector: 结果向量
+            weight_bound (int): 错误向量重量上界，为None时不限制
+            
+        Returns:
+            List[int]: 假设文字列表
+        """
+        assumptions = []
+        for i, selector in enumerate(self.row_selectors):
+            result_bit = 1 if i < len(vector) and vector[i] == 1 else 0
+            assumptions.append(selector if result_bit else -selector)
+        
+        if weight_bound is not None:
+            if weight_bound >= len(self.weight_outputs):
+                raise ValueError(f"重量上界{weight_bound}超出编码的最大重量")
+            assumptions.append(-self.weight_outputs[weight_bound])
+        
+        with open(self.output_file, 'a') as f:
+            f.write("a " + " ".join(str(lit) for lit in assumptions + [0]) + "\n")
+        self.variant_count += 1
+        return assumptions
+    
+    def encode_linear_map(self, matrix: np.ndarray, inputs: np.ndarray,
+                          outputs: Optional[np.ndarray] = None, results: Optional[np.ndarray] = None,
+                          cse: bool = True) -> np.ndarray:
+        """
+        编码GF(2)线性映射：每行满足 XOR(matrix[i]·inputs) ^ outputs[i] = results[i]
+        启用cse时先对所有行做公共子表达式消除，共享的部分和只编码一次
+        
+        Args:
+            matrix: rows×len(inputs)的0/1矩阵
+            inputs: 输入变量编号
+            outputs: 每行的输出变量编号，为None时分配新的辅助变量
+            results: 每行的结果位，默认全为0（即outputs等于该行的异或和）
+            cse (bool): 是否进行公共子表达式消除
+            
+        Returns:
+            np.ndarray: 输出变量编号
+        """
+        matrix = np.asarray(matrix, dtype=np.uint8)
+        inputs = np.asarray(inputs, dtype=np.int64)
+        num_rows = len(matrix)
+        if outputs is None:
+            outputs = self.allocate_variables('auxiliary', num_rows) + np.arange(num_rows)
+        if results is None:
+            results = np.zeros(num_rows, dtype=np.int64)
+        
+        signals = inputs
+        if cse:
+            matrix, gates = eliminate_common_subexpressions(matrix)
+            if len(gates):
+                # 每个门 g = a ^ b 编码为 a^b^g = 0
+                gate_vars = self.allocate_variables('auxiliary', len(gates)) + np.arange(len(gates))
+                signals = np.concatenate([inputs, gate_vars])
+                self._write_xor_block(np.column_stack([signals[gates[:, 0]], signals[gates[:, 1]],
+                                                       gate_vars]),
+                                      np.zeros(len(gates), dtype=np.int64))
+        
+        indptr, indices = matrix_to_csr(matrix)
+        self._encode_rows(indptr, signals[indices], np.asarray(results, dtype=np.int64),
+                          extra=np.asarray(outputs, dtype=np.int64))
+        return outputs
+    
+    def encode_constant_multiplication(self, c: int, inputs: np.ndarray, cse: bool = True) -> np.ndarray:
+        """
+        编码域元素与常数的乘积 z = c·x
+        
+        Args:
+            c (int): 常数
+            inputs: x的m个比特变量（低位在前）
+            cse (bool): 是否进行公共子表达式消除
+            
+        Returns:
+            np.ndarray: z的m个比特变量
+        """
+        return self.encode_linear_map(multiplication_matrix(self.field_math, c), inputs, cse=cse)
+    
+    def encode_variable_multiplication(self, x: np.ndarray, y: np.ndarray, cse: bool = True) -> np.ndarray:
+        """
+        编码两个未知域元素的乘积 z = x·y
+        m²个比特积 x_i∧y_j 各用3个子句编码，再经约化矩阵线性组合得到z
+        
+        Args:
+            x: x的m个比特变量（低位在前）
+            y: y的m个比特变量（低位在前）
+            cse (bool): 是否对约化部分进行公共子表达式消除
+            
+        Returns:
+            np.ndarray: z的m个比特变量
+        """
+        a = np.repeat(np.asarray(x, dtype=np.int64), self.m)
+        b = np.tile(np.asarray(y, dtype=np.int64), self.m)
+        products = self.allocate_variables('product', self.m * self.m) + np.arange(self.m * self.m)
+        self.write_clauses(np.column_stack([-products, a]))
+        self.write_clauses(np.column_stack([-products, b]))
+        self.write_clauses(np.column_stack([products, -a, -b]))
+        return self.encode_linear_map(reduction_matrix(self.field_math), products, cse=cse)
+    
+    def convert_field_system_to_cnf(self, matrix: np.ndarray, vector: np.ndarray,
+                                    max_weight: Optional[int] = None, cse: bool = True):
+        """
+        以域元素为未知量转换方程 y = u·G + e
+        消息符号u与错误向量e均为未知量，u·G按常数乘法电路编码并在所有行间共享公共子表达式，
+        错误比特仍占用变量1..m(n+w)
+        
+        Args:
+            matrix: k×(n+w)的公钥矩阵G
+            vector: 接收向量y
+            max_weight (int): 错误向量重量上界，为None时不限制
+            cse (bool): 是否进行公共子表达式消除
+        """
+        matrix = np.asarray(matrix)
+        length = self.n + self.w
+        if matrix.ndim != 2 or matrix.shape[1] != length:
+            raise ValueError(f"公钥矩阵应有{length}列")
+        vector = np.asarray(vector, dtype=np.int64)
+        if len(vector) != length or vector.min() < 0 or vector.max() >= (1 << self.m):
+            raise ValueError(f"接收向量应为长度{length}的GF(2^{self.m})向量")
+        
+        self.clear_output_file()
+        self.clause_count = 0
+        self.clauses = []
+        self.variable_count = 0
+        self.variable_blocks = []
+        
+        errors = self.allocate_variables('error', self.m * length) + np.arange(self.m * length)
+        num_symbols = self.m * matrix.shape[0]
+        symbols = self.allocate_variables('symbol', num_symbols) + np.arange(num_symbols)
+        
+        system = field_system_matrix(self.field_math, matrix)
+        targets = ((vector[:, None] >> np.arange(self.m)) & 1).reshape(-1)
+        self.xor_constraints = [
+            (symbols[np.nonzero(row)[0]].tolist() + [int(e)], int(r))
+            for row, e, r in zip(system, errors, targets)
+        ]
+        self.encode_linear_map(system, symbols, outputs=errors, results=targets, cse=cse)
+        
+        self.weight_outputs = []
+        if max_weight is not None:
+            self._encode_weight_counter(max_weight, errors.reshape(length, self.m))
+            self.write_clause(str(-self.weight_outputs[max_weight]))
+        
+        if self.preprocess:
+            self._flush_preprocessed()
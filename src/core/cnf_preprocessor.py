@@ -0,0 +1,149 @@
+"""
+CNF预处理模块
+在输出前对子句进行单元传播、去重、包含消去以及变量重新编号
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+Clause = Tuple[int, ...]
+
+
+class CNFPreprocessor:
+    def __init__(self, num_vars: int):
+        """
+        初始化CNF预处理器
+
+        Args:
+            num_vars (int): 原始变量个数
+        """
+        self.num_vars = num_vars
+        # 单元传播确定的变量取值（原始编号 -> True/False）
+        self.fixed_assignments: Dict[int, bool] = {}
+        # 原始编号 -> 新编号，0表示变量已被消去
+        self.variable_map = np.zeros(num_vars + 1, dtype=np.int64)
+        self.unsatisfiable = False
+
+    @staticmethod
+    def _normalize(clause: Clause) -> Optional[Clause]:
+        """去除重复文字并排序，重言式返回None"""
+        literals = set(clause)
+        for lit in literals:
+            if -lit in literals:
+                return None
+        return tuple(sorted(literals, key=lambda x: (abs(x), x)))
+
+    @staticmethod
+    def _signature(clause: Clause) -> int:
+        """子句的64位文字签名，用于快速排除不可能的包含关系"""
+        sig = 0
+        for lit in clause:
+            sig |= 1 << (hash(lit) & 63)
+        return sig
+
+    def _propagate_units(self, clauses: List[Clause]) -> List[Clause]:
+        """反复进行单元传播，直至不再产生新的单元子句"""
+        assignment = self.fixed_assignments
+        while True:
+            units = [c[0] for c in clauses if len(c) == 1]
+            if not units:
+                return clauses
+            for lit in units:
+                value = lit > 0
+                if assignment.get(abs(lit), value) != value:
+                    self.unsatisfiable = True
+                    return [()]
+                assignment[abs(lit)] = value
+
+            simplified = []
+            for clause in clauses:
+                remaining = []
+                satisfied = False
+                for lit in clause:
+                    value = assignment.get(abs(lit))
+                    if value is None:
+                        remaining.append(lit)
+                    elif value == (lit > 0):
+                        satisfied = True
+                        break
+                if satisfied:
+                    continue
+                if not remaining:
+                    self.unsatisfiable = True
+                    return [()]
+                simplified.append(tuple(remaining))
+            clauses = simplified
+
+    def _remove_subsumed(self, clauses: List[Clause]) -> List[Clause]:
+        """删除被更短子句包含的子句"""
+        order = sorted(range(len(clauses)), key=lambda i: len(clauses[i]))
+        signatures = [self._signature(c) for c in clauses]
+        sets = [frozenset(c) for c in clauses]
+        occurrences: Dict[int, List[int]] = {}
+        for i, clause in enumerate(clauses):
+            for lit in clause:
+                occurrences.setdefault(lit, []).append(i)
+
+        removed = [False] * len(clauses)
+        for i in order:
+            if removed[i]:
+                continue
+            clause = clauses[i]
+            # 只需检查出现次数最少的文字所在的子句
+            pivot = min(clause, key=lambda lit: len(occurrences[lit]))
+            sig = signatures[i]
+            for j in occurrences[pivot]:
+                if j == i or removed[j] or len(clauses[j]) < len(clause):
+                    continue
+                if sig & ~signatures[j]:
+                    continue
+                if sets[i] <= sets[j]:
+                    removed[j] = True
+        return [c for i, c in enumerate(clauses) if not removed[i]]
+
+    def _renumber(self, clauses: List[Clause]) -> List[Clause]:
+        """将剩余变量按原顺序紧凑编号"""
+        used = sorted({abs(lit) for clause in clauses for lit in clause})
+        self.variable_map[:] = 0
+        self.variable_map[used] = np.arange(1, len(used) + 1)
+        vmap = self.variable_map
+        return [tuple(int(vmap[lit]) if lit > 0 else -int(vmap[-lit]) for lit in clause)
+                for clause in clauses]
+
+    def process(self, clauses: List[Clause]) -> List[Clause]:
+        """
+        执行完整的预处理流程
+
+        Args:
+            clauses: 原始子句列表，每个子句为文字元组
+
+        Returns:
+            List[Clause]: 预处理后的子句列表（使用新编号）
+        """
+        self.fixed_assignments = {}
+        self.unsatisfiable = False
+
+        # 去除重言式、子句内重复文字以及重复子句
+        normalized = {}
+        for clause in clauses:
+            clause = self._normalize(clause)
+            if clause is not None:
+                normalized.setdefault(clause, None)
+        result = list(normalized)
+
+        if any(len(c) == 0 for c in result):
+            self.unsatisfiable = True
+            result = [()]
+        else:
+            result = self._propagate_units(result)
+
+        if not self.unsatisfiable:
+            result = list(dict.fromkeys(self._normalize(c) for c in result))
+            result = self._remove_subsumed(result)
+
+        return self._renumber(result)
+
+    @property
+    def new_variable_count(self) -> int:
+        """预处理后的变量个数"""
+        return int(self.variable_map.max()) if len(self.variable_map) else 0
@@ -0,0 +1,529 @@
+"""
+GF(2)感知的参考求解器模块
+结合CDCL子句学习与XOR约束的高斯-约当传播，用于小规模实例的端到端验证
+"""
+
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class SolverResult:
+    """求解结果"""
+    status: str                                   # SAT / UNSAT / UNKNOWN
+    model: Optional[np.ndarray] = None            # 按变量编号索引的布尔数组，下标0不使用
+    conflicts: int = 0
+    decisions: int = 0
+    propagations: int = 0
+    gauss_propagations: int = 0
+    learnt_clauses: int = 0
+    time: float = 0.0
+    recovered: Optional[bool] = None              # 是否恢复出预置的错误向量
+
+
+def read_icnf(path: str) -> Tuple[int, List[List[int]], List[Tuple[List[int], int]], List[List[int]]]:
+    """
+    读取DIMACS CNF或增量CNF（iCNF）文件，同时支持以x开头的XOR约束行
+
+    Returns:
+        Tuple: (变量数, 子句列表, XOR约束列表, 各变体的假设列表)
+    """
+    num_vars = 0
+    clauses = []
+    xors = []
+    assumptions = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == 'c':
+                continue
+            if line[0] == 'p':
+                fields = line.split()
+                if fields[1] == 'cnf':
+                    num_vars = int(fields[2])
+                continue
+            if line[0] == 'a':
+                assumptions.append([int(x) for x in line[1:].split()[:-1]])
+                continue
+            if line[0] == 'x':
+                lits = [int(x) for x in line[1:].split()[:-1]]
+                rhs = 1
+                variables = []
+                for lit in lits:
+                    if lit < 0:
+                        rhs ^= 1
+                    variables.append(abs(lit))
+                xors.append((variables, rhs))
+                continue
+            clauses.append([int(x) for x in line.split()[:-1]])
+
+    # iCNF文件头不含变量数
+    for lits in clauses + assumptions + [vs for vs, _ in xors]:
+        for lit in lits:
+            num_vars = max(num_vars, abs(lit))
+    return num_vars, clauses, xors, assumptions
+
+
+def read_dimacs(path: str) -> Tuple[int, List[List[int]], List[Tuple[List[int], int]]]:
+    """
+    读取DIMACS CNF文件，同时支持以x开头的XOR约束行
+
+    Returns:
+        Tuple: (变量数, 子句列表, XOR约束列表)
+    """
+    return read_icnf(path)[:3]
+
+
+def error_vector_to_bits(error_vector: np.ndarray, m: int) -> np.ndarray:
+    """将GF(2^m)错误向量按位置优先、低位在前的顺序展开为比特向量"""
+    e = np.asarray(error_vector, dtype=np.int64).reshape(-1)
+    return ((e[:, None] >> np.arange(m)) & 1).reshape(-1).astype(bool)
+
+
+def _luby(i: int) -> int:
+    """Luby重启序列的第i项（从1开始）"""
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if (1 << k) - 1 == i:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class GF2Solver:
+    RESTART_BASE = 100
+    VAR_DECAY = 0.95
+
+    def __init__(self, num_vars: int, clauses: Iterable[Sequence[int]] = (),
+                 xors: Iterable[Tuple[Sequence[int], int]] = ()):
+        """
+        初始化求解器
+
+        Args:
+            num_vars (int): 变量个数
+            clauses: CNF子句列表
+            xors: XOR约束列表，每项为(变量列表, 右端值)
+        """
+        self.num_vars = num_vars
+        self.clauses: List[List[int]] = []
+        self.watches: Dict[int, List[int]] = {}
+        self.assign = [0] * (num_vars + 1)        # 1为真，-1为假，0未赋值
+        self.level = [0] * (num_vars + 1)
+        self.reason: List[Optional[List[int]]] = [None] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.phase = [False] * (num_vars + 1)
+        self.var_inc = 1.0
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        # 压缩的XOR行：(变量位掩码, 右端值)
+        self.xor_rows: List[Tuple[int, int]] = []
+        self.ok = True
+
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.gauss_propagations = 0
+        self.learnt_clauses = 0
+
+        for clause in clauses:
+            self.add_clause(clause)
+        for variables, rhs in xors:
+            self.add_xor(variables, rhs)
+
+    @classmethod
+    def from_dimacs(cls, path: str) -> 'GF2Solver':
+        """从DIMACS文件创建求解器"""
+        num_vars, clauses, xors = read_dimacs(path)
+        return cls(num_vars, clauses, xors)
+
+    @classmethod
+    def from_converter(cls, converter) -> 'GF2Solver':
+        """
+        从CNFConverter的输出创建求解器
+        预处理过的CNF会被映射回原始变量编号，以便与XOR约束和错误向量对应
+        """
+        num_vars, clauses, xors = read_dimacs(converter.output_file)
+        pre = converter.preprocessor
+        if pre is not None:
+            num_vars = pre.num_vars
+            inverse = np.nonzero(pre.variable_map)[0]
+            clauses = [[int(inverse[abs(lit) - 1]) * (1 if lit > 0 else -1) for lit in clause]
+                       for clause in clauses]
+            clauses.extend([v if value else -v] for v, value in pre.fixed_assignments.items())
+        return cls(num_vars, clauses, xors + list(converter.xor_constraints))
+
+    def _value(self, lit: int) -> int:
+        a = self.assign[abs(lit)]
+        return a if lit > 0 else -a
+
+    def _decision_level(self) -> int:
+        return len(self.trail_lim)
+
+    def _enqueue(self, lit: int, reason: Optional[List[int]]):
+        v = abs(lit)
+        self.assign[v] = 1 if lit > 0 else -1
+        self.level[v] = self._decision_level()
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _watch(self, ci: int):
+        clause = self.clauses[ci]
+        self.watches.setdefault(clause[0], []).append(ci)
+        self.watches.setdefault(clause[1], []).append(ci)
+
+    def add_clause(self, clause: Sequence[int]):
+        """在顶层添加子句"""
+        if not self.ok:
+            return
+        lits = []
+        for lit in dict.fromkeys(clause):
+            if -lit in lits:
+                return
+            value = self._value(lit)
+            if value == 1:
+                return
+            if value == 0:
+                lits.append(lit)
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._enqueue(lits[0], None)
+        else:
+            self.clauses.append(lits)
+            self._watch(len(self.clauses) - 1)
+
+    def add_xor(self, variables: Sequence[int], rhs: int):
+        """添加XOR约束，变量出现两次时相互抵消"""
+        mask = 0
+        rhs = int(rhs) & 1
+        for var in variables:
+            if var < 0:
+                rhs ^= 1
+            mask ^= 1 << abs(int(var))
+        if mask:
+            self.xor_rows.append((mask, rhs))
+        elif rhs:
+            self.ok = False
+
+    def _propagate(self) -> Optional[List[int]]:
+        """双观察文字的单元传播，返回冲突子句"""
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            watchers = self.watches.get(false_lit)
+            if not watchers:
+                continue
+            kept: List[int] = []
+            self.watches[false_lit] = kept
+            for pos, ci in enumerate(watchers):
+                clause = self.clauses[ci]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self._value(clause[0]) == 1:
+                    kept.append(ci)
+                    continue
+                for k in range(2, len(clause)):
+                    if self._value(clause[k]) != -1:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(ci)
+                        break
+                else:
+                    kept.append(ci)
+                    if self._value(clause[0]) == -1:
+                        kept.extend(watchers[pos + 1:])
+                        self.qhead = len(self.trail)
+                        return clause
+                    self._enqueue(clause[0], clause)
+        return None
+
+    def _falsified_literals(self, mask: int) -> List[int]:
+        """掩码中已赋值变量在当前赋值下为假的文字"""
+        lits = []
+        while mask:
+            low = mask & -mask
+            v = low.bit_length() - 1
+            lits.append(-v if self.assign[v] == 1 else v)
+            mask ^= low
+        return lits
+
+    def _gauss_propagate(self) -> Tuple[Optional[List[int]], bool]:
+        """
+        在未赋值变量上对XOR行做高斯-约当消元
+
+        Returns:
+            Tuple: (冲突子句, 是否产生了新的蕴含)
+        """
+        if not self.xor_rows:
+            return None, False
+
+        unassigned = 0
+        true_mask = 0
+        for v in range(1, self.num_vars + 1):
+            a = self.assign[v]
+            if a == 0:
+                unassigned |= 1 << v
+            elif a == 1:
+                true_mask |= 1 << v
+
+        # 每个主元行保存完整的原始组合，便于构造理由子句
+        pivots: List[List[int]] = []
+        for full, rhs in self.xor_rows:
+            for pbit, pfull, prhs in pivots:
+                if full & pbit:
+                    full ^= pfull
+                    rhs ^= prhs
+            free = full & unassigned
+            if not free:
+                if bin(full & true_mask).count('1') & 1 != rhs:
+                    return self._falsified_literals(full), False
+                continue
+            pbit = free & -free
+            for row in pivots:
+                if row[1] & pbit:
+                    row[1] ^= full
+                    row[2] ^= rhs
+            pivots.append([pbit, full, rhs])
+
+        implied = False
+        for pbit, full, rhs in pivots:
+            if full & unassigned != pbit:
+                continue
+            v = pbit.bit_length() - 1
+            value = rhs ^ (bin(full & true_mask).count('1') & 1)
+            lit = v if value else -v
+            reason = [lit] + self._falsified_literals(full ^ pbit)
+            self._enqueue(lit, reason)
+            self.gauss_propagations += 1
+            implied = True
+        return None, implied
+
+    def _bump(self, v: int):
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+
+    def _analyze(self, conflict: List[int]) -> Tuple[List[int], int]:
+        """1-UIP冲突分析，返回学习子句和回跳层"""
+        seen = set()
+        learnt = [0]
+        backtrack_level = 0
+        counter = 0
+        p = None
+        idx = len(self.trail) - 1
+        clause = conflict
+        current = self._decision_level()
+        while True:
+            for q in clause:
+                if q == p:
+                    continue
+                v = abs(q)
+                if v in seen or self.level[v] == 0:
+                    continue
+                seen.add(v)
+                self._bump(v)
+                if self.level[v] == current:
+                    counter += 1
+                else:
+                    learnt.append(q)
+                    backtrack_level = max(backtrack_level, self.level[v])
+            while abs(self.trail[idx]) not in seen:
+                idx -= 1
+            p = self.trail[idx]
+            idx -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.reason[abs(p)]
+        learnt[0] = -p
+        return learnt, backtrack_level
+
+    def _backtrack(self, level: int):
+        if self._decision_level() <= level:
+            return
+        limit = self.trail_lim[level]
+        for lit in self.trail[limit:]:
+            v = abs(lit)
+            self.phase[v] = lit > 0
+            self.assign[v] = 0
+            self.reason[v] = None
+        del self.trail[limit:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _add_learnt(self, learnt: List[int]):
+        if len(learnt) == 1:
+            self._enqueue(learnt[0], None)
+            return
+        # 第二观察文字取回跳层最高的文字
+        best = max(range(1, len(learnt)), key=lambda i: self.level[abs(learnt[i])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        self.clauses.append(learnt)
+        self._watch(len(self.clauses) - 1)
+        self.learnt_clauses += 1
+        self._enqueue(learnt[0], learnt)
+
+    def _pick_branch_variable(self) -> Optional[int]:
+        best = None
+        best_activity = -1.0
+        for v in range(1, self.num_vars + 1):
+            if self.assign[v] == 0 and self.activity[v] > best_activity:
+                best = v
+                best_activity = self.activity[v]
+        return best
+
+    def _result(self, status: str, start: float) -> SolverResult:
+        model = None
+        if status == 'SAT':
+            model = np.array([a == 1 for a in self.assign], dtype=bool)
+        return SolverResult(
+            status=status, model=model,
+            conflicts=self.conflicts, decisions=self.decisions,
+            propagations=self.propagations, gauss_propagations=self.gauss_propagations,
+            learnt_clauses=self.learnt_clauses, time=time.time() - start
+        )
+
+    def solve(self, max_conflicts: Optional[int] = None,
+              time_limit: Optional[float] = None,
+              assumptions: Sequence[int] = ()) -> SolverResult:
+        """
+        求解，可重复调用；学习子句在多次调用之间保留
+
+        Args:
+            max_conflicts (int): 冲突次数上限
+            time_limit (float): 时间上限（秒）
+            assumptions: 假设文字，在最前面的决策层依次赋值
+
+        Returns:
+            SolverResult: 求解结果，假设不成立时状态为UNSAT
+        """
+        start = time.time()
+        conflicts_at_start = self.conflicts
+        self._backtrack(0)
+        if not self.ok:
+            return self._result('UNSAT', start)
+
+        restarts = 1
+        restart_limit = self.RESTART_BASE * _luby(restarts)
+        conflicts_since_restart = 0
+
+        while True:
+            conflict = self._propagate()
+            if conflict is None:
+                conflict, implied = self._gauss_propagate()
+                if conflict is None and implied:
+                    continue
+
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts_since_restart += 1
+                if self._decision_level() == 0:
+                    self.ok = False
+                    return self._result('UNSAT', start)
+                learnt, backtrack_level = self._analyze(conflict)
+                self._backtrack(backtrack_level)
+                self._add_learnt(learnt)
+                self.var_inc /= self.VAR_DECAY
+
+                if max_conflicts is not None and self.conflicts - conflicts_at_start >= max_conflicts:
+                    return self._result('UNKNOWN', start)
+                if time_limit is not None and time.time() - start > time_limit:
+                    return self._result('UNKNOWN', start)
+                if conflicts_since_restart >= restart_limit:
+                    self._backtrack(0)
+                    restarts += 1
+                    restart_limit = self.RESTART_BASE * _luby(restarts)
+                    conflicts_since_restart = 0
+                continue
+
+            lit = None
+            while self._decision_level() < len(assumptions):
+                p = assumptions[self._decision_level()]
+                value = self._value(p)
+                if value == -1:
+                    return self._result('UNSAT', start)
+                if value == 0:
+                    lit = p
+                    break
+                # 已满足的假设占用一个空决策层
+                self.trail_lim.append(len(self.trail))
+
+            if lit is None:
+                v = self._pick_branch_variable()
+                if v is None:
+                    return self._result('SAT', start)
+                lit = v if self.phase[v] else -v
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, None)
+
+
+def verify_instance(converter, error_vector: Optional[np.ndarray], max_conflicts: Optional[int] = None,
+                    time_limit: Optional[float] = None) -> SolverResult:
+    """
+    求解CNFConverter生成的实例，并检查是否恢复出预置的错误向量
+
+    Args:
+        converter: 已完成转换的CNFConverter
+        error_vector: 预置的错误向量，实例不以错误比特为未知量时传入None，此时不检查恢复结果
+        max_conflicts (int): 冲突次数上限
+        time_limit (float): 时间上限（秒）
+
+    Returns:
+        SolverResult: 求解结果，recovered字段表示错误向量是否被恢复
+    """
+    solver = GF2Solver.from_converter(converter)
+    result = solver.solve(max_conflicts=max_conflicts, time_limit=time_limit)
+    if result.model is not None and error_vector is not None:
+        bits = error_vector_to_bits(error_vector, converter.m)
+        limit = min(len(bits), solver.num_vars)
+        result.recovered = bool(np.array_equal(result.model[1:limit + 1], bits[:limit])
+                                and not bits[limit:].any())
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    以SAT竞赛输出格式求解DIMACS文件，退出码10表示可满足、20表示不可满足
+    iCNF文件的每个假设行输出一组结果，退出码取最后一个变体
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description='GF(2)感知的参考SAT求解器')
+    parser.add_argument('cnf_file', type=str, help='DIMACS CNF或iCNF文件')
+    parser.add_argument('--max-conflicts', type=int, help='冲突次数上限')
+    parser.add_argument('--time-limit', type=float, help='时间上限（秒）')
+    args = parser.parse_args(argv)
+
+    num_vars, clauses, xors, variants = read_icnf(args.cnf_file)
+    solver = GF2Solver(num_vars, clauses, xors)
+    # 普通CNF视为只有一个空假设的变体；iCNF按假设行依次求解
+    returncode = 0
+    for assumptions in variants or [[]]:
+        result = solver.solve(max_conflicts=args.max_conflicts, time_limit=args.time_limit,
+                              assumptions=assumptions)
+        returncode = _print_result(result)
+    return returncode
+
+
+def _print_result(result: SolverResult) -> int:
+    print(f"c conflicts {result.conflicts} decisions {result.decisions} time {result.time:.3f}")
+    if result.status == 'SAT':
+        print("s SATISFIABLE")
+        lits = [v if result.model[v] else -v for v in range(1, len(result.model))]
+        print("v " + " ".join(str(lit) for lit in lits) + " 0")
+        return 10
+    if result.status == 'UNSAT':
+        print("s UNSATISFIABLE")
+        return 20
+    print("s UNKNOWN")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+有限域乘法电路模块
+将GF(2^m)中的乘法表示为GF(2)上的线性映射，并对XOR电路做公共子表达式消除
+"""
+
+import numpy as np
+from typing import Tuple
+from .field_math import FieldMath
+
+
+def multiplication_matrix(field_math: FieldMath, c: int) -> np.ndarray:
+    """
+    乘以常数c的比特矩阵
+
+    Returns:
+        np.ndarray: m×m的0/1矩阵M，满足bits(c·x) = M·bits(x)（比特低位在前）
+    """
+    m = field_math.m
+    if not 0 <= c < (1 << m):
+        raise ValueError(f"{c}不是GF(2^{m})中的元素")
+    columns = [field_math.gf_mul(c, 1 << j) if c else 0 for j in range(m)]
+    return ((np.array(columns)[None, :] >> np.arange(m)[:, None]) & 1).astype(np.uint8)
+
+
+def field_system_matrix(field_math: FieldMath, matrix: np.ndarray) -> np.ndarray:
+    """
+    将域上矩阵G展开为比特矩阵，使bits(u·G) = B·bits(u)
+
+    Args:
+        field_math: 有限域运算对象
+        matrix: k×N的域上矩阵
+
+    Returns:
+        np.ndarray: (m·N)×(m·k)的0/1矩阵，输出第j个符号的第b比特对应第j·m+b行
+    """
+    m = field_math.m
+    matrix = np.asarray(matrix)
+    rows, cols = matrix.shape
+    cache = {}
+    result = np.zeros((m * cols, m * rows), dtype=np.uint8)
+    for i in range(rows):
+        for j in range(cols):
+            c = int(matrix[i, j])
+            if c not in cache:
+                cache[c] = multiplication_matrix(field_math, c)
+            result[j * m:(j + 1) * m, i * m:(i + 1) * m] = cache[c]
+    return result
+
+
+def reduction_matrix(field_math: FieldMath) -> np.ndarray:
+    """
+    变量乘法的约化矩阵
+
+    Returns:
+        np.ndarray: m×m²的0/1矩阵R，满足bits(x·y) = R·p，其中p[i·m+j] = x_i ∧ y_j
+    """
+    m = field_math.m
+    values = np.array([field_math.gf_mul(1 << i, 1 << j) for i in range(m) for j in range(m)])
+    return ((values[None, :] >> np.arange(m)[:, None]) & 1).astype(np.uint8)
+
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(packed: np.ndarray) -> np.ndarray:
+    """按最后一维统计打包比特中1的个数"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(packed).sum(axis=-1, dtype=np.int64)
+    bytes_view = packed.view(np.uint8)
+    return _POPCOUNT[bytes_view].sum(axis=-1, dtype=np.int64)
+
+
+def _initial_bounds(signals: np.ndarray, chunk_words: int = 1 << 20) -> np.ndarray:
+    """分块计算每个信号与其他信号的最大共现次数，内存占用与块大小成正比"""
+    n, words = signals.shape
+    best = np.zeros(n, dtype=np.int64)
+    step = max(1, chunk_words // max(1, n * words))
+    for start in range(0, n, step):
+        block = signals[start:start + step]
+        counts = _popcount_rows(block[:, None, :] & signals[None, :, :])
+        counts[np.arange(len(block)), start + np.arange(len(block))] = 0
+        best[start:start + len(block)] = counts.max(axis=1)
+    return best
+
+
+def eliminate_common_subexpressions(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    贪心公共子表达式消除（Paar算法）
+    反复选取在最多行中同时出现的一对信号，引入新的XOR门替换之
+    每个信号只维护与其他信号最大共现次数的上界，选中时再精确计算，避免存储完整的共现矩阵
+
+    Args:
+        matrix: rows×n的0/1矩阵，每行为一个输出的XOR输入集合
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (rows×(n+G)的约简矩阵, G×2的门输入信号下标)，
+        第g个门的输出信号下标为n+g
+    """
+    matrix = np.asarray(matrix, dtype=np.uint8) & 1
+    num_rows, n = matrix.shape
+    capacity = max(2 * n, 16)
+    # 按信号存储打包为64位字的比特集合（每行为一个信号出现的输出集合）
+    words = (num_rows + 63) // 64
+    signals = np.zeros((capacity, words), dtype=np.uint64)
+    packed = np.zeros((n, words * 8), dtype=np.uint8)
+    packed[:, :(num_rows + 7) // 8] = np.packbits(matrix.T, axis=1)
+    signals[:n] = packed.view(np.uint64)
+    best = np.zeros(capacity, dtype=np.int64)
+    best[:n] = _initial_bounds(signals[:n])
+    size = n
+    gates = []
+
+    while size > 1:
+        a = int(np.argmax(best[:size]))
+        if best[a] < 2:
+            break
+        row = _popcount_rows(signals[:size] & signals[a])
+        row[a] = 0
+        b = int(np.argmax(row))
+        if row[b] < best[a]:
+            # 上界已过时，修正后重新选择
+            best[a] = row[b]
+            continue
+
+        both = signals[a] & signals[b]
+        signals[a] ^= both
+        signals[b] ^= both
+        if size == capacity:
+            capacity *= 2
+            signals = np.concatenate([signals, np.zeros_like(signals)])
+            best = np.concatenate([best, np.zeros_like(best)])
+        signals[size] = both
+        gates.append((a, b))
+
+        # 除新信号外的共现次数只减不增，仅新信号可能提高其他信号的上界
+        row = _popcount_rows(signals[:size] & both)
+        best[:size] = np.maximum(best[:size], row)
+        best[size] = row.max()
+        size += 1
+    reduced = np.unpackbits(signals[:size].view(np.uint8), axis=1, count=num_rows).T
+    return reduced, np.array(gates, dtype=np.int64).reshape(-1, 2)
@@ -10,7 +10,7 @@ import reedsolo as rs
 from .field_math import FieldMath
 
 class RLCE:
-    def __init__(self, n, k, t, m, w):
+    def __init__(self, n, k, t, m, w, rng=None):
         """
         初始化RLCE方案
         
@@ -20,6 +20,7 @@ class RLCE:
             t (int): 错误纠正能力
             m (int): 有限域的指数
             w (int): 插入的列数
+            rng (np.random.Generator): 随机数生成器，为None时使用新的随机种子
         """
         self.n = n
         self.k = k
@@ -28,6 +29,7 @@ class RLCE:
         self.w = w
         self.nsym = n - k  # ECC长度
         self.field_math = FieldMath(m)
+        self.rng = rng if rng is not None else np.random.default_rng()
         
     def generate_rs_poly(self):
         """生成Reed-Solomon码生成多项式"""
@@ -50,7 +52,7 @@ class RLCE:
     
     def generate_v_matrix(self):
         """生成V矩阵"""
-        a = np.random.randint(1, self.n-2, self.n)
+        a = self.rng.integers(1, self.n-2, self.n)
         return np.diag(a)
     
     def generate_gs_matrix(self, g):
@@ -61,14 +63,14 @@ class RLCE:
     
     def generate_r_matrix(self):
         """生成R矩阵"""
-        return np.random.randint(1, self.n, size=(self.k, self.w))
+        return self.rng.integers(1, self.n, size=(self.k, self.w))
     
     def generate_g1_matrix(self, g):
         """生成G1矩阵"""
         m = self.generate_gs_matrix(g)
         RB = self.generate_r_matrix()
         for j in range(self.w):
-            x = np.random.randint(1, self.n)
+            x = int(self.rng.integers(1, self.n))
             m = np.insert(m, x, RB[:, j], axis=1)
         return m
     
@@ -77,7 +79,7 @@ class RLCE:
         IA = np.matlib.eye(self.n-self.w, dtype=int)
         for i in range(self.w):
             while True:
-                A = np.random.randint(0, self.n-1, (2, 2))
+                A = self.rng.integers(0, self.n-1, (2, 2))
                 if np.linalg.det(A) != 0:
                     break
             IA = scipy.linalg.block_diag(IA, A)
@@ -92,7 +94,7 @@ class RLCE:
     def generate_permutation_matrix(self):
         """生成置换矩阵P"""
         x = np.matlib.eye(self.n+self.w, dtype=int)
-        return np.random.permutation(x)
+        return self.rng.permutation(x)
     
     def generate_g3_matrix(self, g):
         """生成G3矩阵"""
@@ -104,7 +106,7 @@ class RLCE:
     def generate_s_matrix(self):
         """生成非奇异矩阵S"""
         while True:
-            x = np.random.randint(0, self.n-1, (self.k, self.k))
+            x = self.rng.integers(0, self.n-1, (self.k, self.k))
             if np.linalg.det(x) != 0:
                 break
         return x
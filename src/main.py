@@ -6,6 +6,8 @@ import os
 import sys
 import argparse
 import logging
+import shutil
+import tempfile
 import numpy as np
 from pathlib import Path
 
@@ -14,8 +16,13 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from core.rlce import RLCE
 from core.cnf_converter import CNFConverter
+from core.gf2_solver import verify_instance
 from utils.config import RLCEConfig
 from utils.error_generator import ErrorGenerator
+from utils.artifact_store import ArtifactStore
+from utils.solver_runner import SolverRunner, SolverInstance, VARIABLE_MAP_SUFFIX
+from utils.variable_map import VariableMap
+from utils.instance_cache import InstanceCache
 
 
 class RLCEToCNF:
@@ -32,13 +39,16 @@ class RLCEToCNF:
         # 创建输出目录
         os.makedirs(config.output_dir, exist_ok=True)
         
-        # 初始化各个组件
-        self.rlce = RLCE(config.n, config.k, config.t, config.m, config.w)
+        # 初始化各个组件，随机数流由seed派生
+        rlce_rng, error_rng, message_rng = config.spawn_generators(3)
+        self.rlce = RLCE(config.n, config.k, config.t, config.m, config.w, rng=rlce_rng)
         self.cnf_converter = CNFConverter(
             config.m, config.n, config.w, config.k,
-            os.path.join(config.output_dir, config.cnf_file)
+            os.path.join(config.output_dir, config.cnf_file),
+            preprocess=config.preprocess
         )
-        self.error_generator = ErrorGenerator(config.seed)
+        self.error_generator = ErrorGenerator(rng=error_rng)
+        self.message_rng = message_rng
         
         # 设置日志
         self._setup_logging()
@@ -68,23 +78,45 @@ class RLCEToCNF:
         
         # 生成错误向量
         self.logger.info("生成错误向量...")
-        self.error_vector = self.error_generator.generate_weight_t_error(
-            self.config.n + self.config.w, self.config.t
-        )
+        if self.config.encoding == "field":
+            # 错误值须为GF(2^m)中的元素
+            self.error_vector = self.error_generator.generate_weight_t_errors(
+                1, self.config.n + self.config.w, self.config.t, m=self.config.m
+            )[0]
+        else:
+            self.error_vector = self.error_generator.generate_weight_t_error(
+                self.config.n + self.config.w, self.config.t
+            )
         self.logger.info(f"错误向量重量: {np.count_nonzero(self.error_vector)}")
         
         return self.public_key, self.error_vector
     
+    def generate_received_vector(self, public_key, error_vector):
+        """随机选取消息符号u，计算接收向量 y = u·G + e"""
+        field_math = self.cnf_converter.field_math
+        self.message = self.message_rng.integers(0, 1 << self.config.m, self.config.k)
+        codeword = field_math.matrix_mul(self.message.reshape(1, -1), public_key)
+        self.received_vector = np.bitwise_xor(np.asarray(codeword, dtype=np.int64).reshape(-1),
+                                              error_vector)
+        return self.received_vector
+    
     def convert_to_cnf(self, matrix, vector):
         """将矩阵方程转换为CNF"""
         self.logger.info("开始转换为CNF格式...")
         
         # 执行转换
-        self.cnf_converter.convert_matrix_to_cnf(matrix, vector)
+        if self.config.encoding == "field":
+            self.cnf_converter.convert_field_system_to_cnf(matrix, vector, max_weight=self.config.t)
+        else:
+            self.cnf_converter.convert_matrix_to_cnf(matrix, vector)
         
         # 写入CNF头部
         self.cnf_converter.write_cnf_header()
         
+        # 写入变量映射边车文件
+        self.variable_map_file = self.cnf_converter.output_file + VARIABLE_MAP_SUFFIX
+        VariableMap.from_converter(self.cnf_converter).save(self.variable_map_file)
+        
         self.logger.info(f"CNF文件已生成: {self.cnf_converter.output_file}")
         self.logger.info(f"变量数: {self.cnf_converter.variable_count}")
         self.logger.info(f"子句数: {self.cnf_converter.clause_count}")
@@ -94,6 +126,17 @@ class RLCEToCNF:
     def run(self):
         """运行完整的转换流程"""
         try:
+            cache, key = self._open_cache()
+            if cache is not None and self._restore_from_cache(cache, key):
+                cnf_file = self.cnf_converter.output_file
+                if self.config.verify:
+                    self.logger.info("缓存命中，跳过内置求解器验证")
+                if self.config.solvers:
+                    error_file = self.cached_files.get('error_vector.npy')
+                    error_vector = np.load(error_file) if error_file else None
+                    self.solve(cnf_file, error_vector)
+                return cnf_file
+            
             # 生成RLCE系统
             public_key, error_vector = self.generate_rlce_system()
             
@@ -101,7 +144,23 @@ class RLCEToCNF:
             self._save_matrices(public_key, error_vector)
             
             # 转换为CNF
-            cnf_file = self.convert_to_cnf(public_key, error_vector)
+            matrices = {'public_key.npy': public_key, 'error_vector.npy': error_vector}
+            if self.config.encoding == "field":
+                received_vector = self.generate_received_vector(public_key, error_vector)
+                np.save(self._artifact_paths()['received_vector.npy'], received_vector)
+                matrices['received_vector.npy'] = received_vector
+                cnf_file = self.convert_to_cnf(public_key, received_vector)
+            else:
+                cnf_file = self.convert_to_cnf(public_key, error_vector)
+            
+            if cache is not None:
+                self._store_in_cache(cache, key, matrices)
+            
+            if self.config.verify:
+                self.verify(error_vector)
+            
+            if self.config.solvers:
+                self.solve(cnf_file, error_vector)
             
             self.logger.info("转换完成!")
             self.logger.info(f"输出文件: {cnf_file}")
@@ -112,8 +171,187 @@ class RLCEToCNF:
             self.logger.error(f"转换过程中出现错误: {str(e)}")
             raise
     
-    def _save_matrices(self, public_key, error_vector):
-        """保存矩阵到文件"""
+    def verify(self, error_vector):
+        """使用内置求解器验证生成的实例"""
+        self.logger.info("使用内置求解器验证实例...")
+        if self.config.encoding != "field":
+            # bit编码的方程右端不含预置的错误比特，模型与错误向量无法比较
+            self.logger.warning("bit编码不包含预置的错误向量，只检查可满足性；"
+                                "使用 --encoding field 进行端到端验证")
+            error_vector = None
+        result = verify_instance(self.cnf_converter, error_vector)
+        self.logger.info(f"求解结果: {result.status}")
+        if result.recovered is not None:
+            self.logger.info(f"恢复错误向量: {result.recovered}")
+        self.logger.info(f"冲突数: {result.conflicts}, 决策数: {result.decisions}, "
+                         f"用时: {result.time:.3f}s")
+        return result
+    
+    def run_family(self):
+        """
+        生成共享同一公钥的增量实例族
+        公钥相关子句只写入一次，每个错误向量与重量上界的组合只追加一行假设
+        """
+        try:
+            cache, key = self._open_cache()
+            if cache is not None and self._restore_from_cache(cache, key):
+                return self.cnf_converter.output_file
+            
+            self.logger.info("开始生成增量实例族...")
+            self.logger.info(f"使用配置: {self.config}")
+            
+            public_key = self.rlce.generate_public_key()
+            self.public_key = public_key
+            self.logger.info(f"公钥矩阵形状: {public_key.shape}")
+            
+            length = self.config.n + self.config.w
+            error_vectors = self.error_generator.generate_weight_t_errors(
+                self.config.variants, length, self.config.t, m=self.config.m
+            )
+            self.error_vectors = error_vectors
+            self._save_family(public_key, error_vectors)
+            
+            bounds = self.config.weight_bounds or [self.config.t]
+            self.cnf_converter.convert_matrix_to_icnf(public_key, max_weight=max(bounds))
+            for error_vector in error_vectors:
+                for bound in bounds:
+                    self.cnf_converter.add_variant(error_vector, bound)
+            
+            self.variable_map_file = self.cnf_converter.output_file + VARIABLE_MAP_SUFFIX
+            VariableMap.from_converter(self.cnf_converter).save(self.variable_map_file)
+            
+            cnf_file = self.cnf_converter.output_file
+            if cache is not None:
+                self._store_in_cache(cache, key, {'public_key.npy': public_key,
+                                                  'error_vectors.npy': error_vectors})
+            self.logger.info(f"iCNF文件已生成: {cnf_file}")
+            self.logger.info(f"变量数: {self.cnf_converter.variable_count}")
+            self.logger.info(f"子句数: {self.cnf_converter.clause_count}")
+            self.logger.info(f"变体数: {self.cnf_converter.variant_count}")
+            return cnf_file
+            
+        except Exception as e:
+            self.logger.error(f"生成增量实例族时出现错误: {str(e)}")
+            raise
+    
+    def _open_cache(self):
+        """打开实例缓存，未配置时返回(None, None)"""
+        if not self.config.cache_dir:
+            return None, None
+        cache = InstanceCache(self.config.cache_dir, self.config.cache_max_bytes)
+        return cache, InstanceCache.key(self.config)
+    
+    def _artifact_paths(self):
+        """各产物角色在输出目录中的路径"""
+        cnf_file = self.cnf_converter.output_file
+        paths = {'cnf': cnf_file, 'vmap': cnf_file + VARIABLE_MAP_SUFFIX}
+        for name in ('public_key.npy', 'error_vector.npy', 'error_vectors.npy', 'received_vector.npy'):
+            paths[name] = os.path.join(self.config.output_dir, name)
+        return paths
+    
+    def _restore_from_cache(self, cache, key):
+        """缓存命中时将产物复制到输出目录，使用产物存储时将缓存的实例追加到存储中"""
+        files = cache.lookup(key)
+        if files is None:
+            return False
+        self.cached_files = files
+        paths = self._artifact_paths()
+        for role, path in files.items():
+            if role in ('cnf', 'vmap') or not self.config.artifact_store:
+                shutil.copyfile(path, paths[role])
+        self.variable_map_file = paths['vmap']
+        
+        if self.config.artifact_store:
+            public_key = np.load(files['public_key.npy'])
+            if 'error_vectors.npy' in files:
+                self._save_family(public_key, np.load(files['error_vectors.npy']))
+            else:
+                self._save_matrices(public_key, np.load(files['error_vector.npy']))
+        else:
+            self.config.save_to_file(os.path.join(self.config.output_dir, "config.json"))
+        self.logger.info(f"缓存命中 ({key[:12]})，已复用CNF文件: {self.cnf_converter.output_file}")
+        return True
+    
+    def _store_in_cache(self, cache, key, matrices):
+        """
+        将本次生成的产物写入缓存
+        
+        Args:
+            cache: 实例缓存
+            key (str): 缓存键
+            matrices: 产物文件名到数组的映射
+        """
+        paths = self._artifact_paths()
+        files = {'cnf': paths['cnf'], 'vmap': paths['vmap']}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, array in matrices.items():
+                if self.config.artifact_store:
+                    # 存储模式下输出目录中没有.npy文件，临时写出以便命中时追加回存储
+                    files[name] = os.path.join(tmpdir, name)
+                    np.save(files[name], array)
+                else:
+                    files[name] = paths[name]
+            cache.store(key, files)
+        self.logger.info(f"产物已写入缓存: {key[:12]}")
+    
+    def _save_family(self, public_key, error_vectors):
+        """保存增量实例族的公钥和全部错误向量"""
+        if self.config.artifact_store:
+            # 存储的每条记录自带公钥，各变体记录各保存一份公钥副本，并以variant区分
+            for variant, error_vector in enumerate(error_vectors):
+                self._save_matrices(public_key, error_vector, variant=variant)
+            return
+        
+        pk_file = os.path.join(self.config.output_dir, "public_key.npy")
+        np.save(pk_file, public_key)
+        error_file = os.path.join(self.config.output_dir, "error_vectors.npy")
+        np.save(error_file, error_vectors)
+        config_file = os.path.join(self.config.output_dir, "config.json")
+        self.config.save_to_file(config_file)
+        self.logger.info(f"公钥、错误向量和配置已保存到: {self.config.output_dir}")
+    
+    def solve(self, cnf_file, error_vector):
+        """调用配置的本地求解器求解，多个求解器时竞速"""
+        self.logger.info(f"调用求解器: {', '.join(self.config.solvers)}")
+        runner = SolverRunner(
+            self.config.solvers,
+            time_limit=self.config.solver_time_limit,
+            memory_limit=self.config.solver_memory_limit
+        )
+        instance = SolverInstance(cnf_file, variable_map=self.variable_map_file)
+        result = runner.run_portfolio(instance)
+        self.logger.info(f"求解器 {result.solver} 结果: {result.status}, 用时: {result.time:.3f}s")
+        if result.error_vector is not None and error_vector is not None \
+                and self.config.encoding == "field":
+            recovered = np.array_equal(result.error_vector, error_vector)
+            self.logger.info(f"恢复错误向量: {recovered}")
+        return result
+    
+    def _save_matrices(self, public_key, error_vector, variant=None):
+        """
+        保存矩阵到文件
+        
+        Args:
+            public_key: 公钥矩阵
+            error_vector: 错误向量
+            variant (int): 增量变体编号，记录在产物存储的逐实例配置中（可选）
+        """
+        if self.config.artifact_store:
+            # 追加到批量存储，避免每个实例单独写文件
+            store = ArtifactStore(
+                self.config.artifact_store, m=self.config.m,
+                config={'n': self.config.n, 'k': self.config.k, 't': self.config.t,
+                        'm': self.config.m, 'w': self.config.w}
+            )
+            # 逐实例记录完整配置，保留seed与instance_id
+            config = self.config.to_dict()
+            if variant is not None:
+                config['variant'] = variant
+            index = store.append(public_key, error_vector, config=config)
+            self.logger.info(f"实例已追加到产物存储: {self.config.artifact_store} (编号 {index})")
+            self.config.save_to_file(os.path.join(self.config.output_dir, "config.json"))
+            return
+        
         # 保存公钥矩阵
         pk_file = os.path.join(self.config.output_dir, "public_key.npy")
         np.save(pk_file, public_key)
@@ -140,8 +378,23 @@ def main():
     parser.add_argument('--m', type=int, default=4, help='有限域指数 (默认: 4)')
     parser.add_argument('--w', type=int, default=4, help='插入列数 (默认: 4)')
     parser.add_argument('--seed', type=int, help='随机数种子')
+    parser.add_argument('--instance-id', type=int, default=0, help='实例编号，与种子共同决定随机数流 (默认: 0)')
     parser.add_argument('--output-dir', type=str, default='output', help='输出目录 (默认: output)')
     parser.add_argument('--cnf-file', type=str, default='output.cnf', help='CNF文件名 (默认: output.cnf)')
+    parser.add_argument('--preprocess', action='store_true', help='输出前对子句进行预处理')
+    parser.add_argument('--verify', action='store_true', help='使用内置求解器验证生成的实例')
+    parser.add_argument('--variants', type=int, default=0,
+                        help='生成共享同一公钥的增量变体数（iCNF格式，默认: 0）')
+    parser.add_argument('--weight-bounds', type=int, nargs='+', help='增量变体的重量上界（默认: t）')
+    parser.add_argument('--solver', type=str, action='append', dest='solvers',
+                        help='本地求解器命令行，可多次指定以竞速求解')
+    parser.add_argument('--solver-timeout', type=float, help='求解时间上限（秒）')
+    parser.add_argument('--solver-memory', type=int, help='求解内存上限（MB）')
+    parser.add_argument('--cache-dir', type=str, help='实例缓存目录（可选）')
+    parser.add_argument('--cache-max-mb', type=float, help='实例缓存总大小上限（MB）')
+    parser.add_argument('--artifact-store', type=str, help='批量产物存储目录（可选）')
+    parser.add_argument('--encoding', type=str, choices=['bit', 'field'], default='bit',
+                        help='编码方式：bit为错误比特上的XOR方程，field为以消息符号为未知量的乘法电路 (默认: bit)')
     
     args = parser.parse_args()
     
@@ -151,12 +404,23 @@ def main():
     else:
         config = RLCEConfig(
             n=args.n, k=args.k, t=args.t, m=args.m, w=args.w,
-            seed=args.seed, output_dir=args.output_dir, cnf_file=args.cnf_file
+            seed=args.seed, instance_id=args.instance_id, output_dir=args.output_dir, cnf_file=args.cnf_file,
+            preprocess=args.preprocess, verify=args.verify,
+            variants=args.variants, weight_bounds=args.weight_bounds,
+            solvers=args.solvers, solver_time_limit=args.solver_timeout,
+            solver_memory_limit=args.solver_memory,
+            cache_dir=args.cache_dir,
+            cache_max_bytes=int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb else None,
+            artifact_store=args.artifact_store,
+            encoding=args.encoding
         )
     
     # 运行转换
     converter = RLCEToCNF(config)
-    converter.run()
+    if config.variants:
+        converter.run_family()
+    else:
+        converter.run()
 
 
 if __name__ == "__main__":
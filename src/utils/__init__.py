@@ -4,5 +4,10 @@
 
 from .config import RLCEConfig
 from .error_generator import ErrorGenerator
+from .artifact_store import ArtifactStore
+from .variable_map import VariableMap
+from .instance_cache import InstanceCache
+from .solver_runner import SolverRunner, SolverSpec, SolverInstance, RunResult
 
-__all__ = ['RLCEConfig', 'ErrorGenerator'] 
\ No newline at end of file
+__all__ = ['RLCEConfig', 'ErrorGenerator', 'ArtifactStore', 'VariableMap', 'InstanceCache', 'SolverRunner', 'SolverSpec',
+           'SolverInstance', 'RunResult'] 
\ No newline at end of file
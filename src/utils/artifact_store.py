@@ -0,0 +1,227 @@
+"""
+实例产物存储模块
+以内存映射、仅追加的方式批量保存公钥矩阵和错误向量
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows下使用msvcrt的文件锁
+    fcntl = None
+    import msvcrt
+
+
+# 索引记录：数据文件中的字节偏移以及公钥/错误向量的形状
+INDEX_DTYPE = np.dtype([
+    ('offset', '<u8'),
+    ('rows', '<u4'),
+    ('cols', '<u4'),
+    ('length', '<u4'),
+])
+
+
+# 决定实例结构的配置项，同一存储中的实例必须一致
+STRUCTURE_KEYS = ('n', 'k', 't', 'm', 'w')
+
+
+def field_dtype(m: int) -> np.dtype:
+    """返回能容纳GF(2^m)元素的最小无符号整数类型"""
+    if m <= 8:
+        return np.dtype(np.uint8)
+    if m <= 16:
+        return np.dtype('<u2')
+    return np.dtype('<u4')
+
+
+class ArtifactStore:
+    DATA_FILE = "data.bin"
+    INDEX_FILE = "index.bin"
+    META_FILE = "meta.json"
+    CONFIG_FILE = "configs.jsonl"
+    LOCK_FILE = "store.lock"
+
+    def __init__(self, path: str, m: Optional[int] = None, config: Optional[dict] = None):
+        """
+        打开或创建产物存储
+
+        Args:
+            path (str): 存储目录
+            m (int): 有限域指数，新建存储时必须提供
+            config (dict): 写入元数据的配置信息（可选），打开已有存储时须与其结构参数一致
+        """
+        self.path = path
+        self.data_file = os.path.join(path, self.DATA_FILE)
+        self.index_file = os.path.join(path, self.INDEX_FILE)
+        self.meta_file = os.path.join(path, self.META_FILE)
+        self.config_file = os.path.join(path, self.CONFIG_FILE)
+        self.lock_file = os.path.join(path, self.LOCK_FILE)
+
+        if os.path.exists(self.meta_file):
+            with open(self.meta_file, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+            if m is not None and m != self.meta['m']:
+                raise ValueError(f"存储的有限域指数为{self.meta['m']}，与m={m}不一致")
+            self._check_config(config)
+        else:
+            if m is None:
+                raise ValueError("新建存储时必须指定m")
+            self.meta = {
+                'm': m,
+                'dtype': field_dtype(m).str,
+                'config': config,
+            }
+            os.makedirs(path, exist_ok=True)
+            with open(self.meta_file, 'w', encoding='utf-8') as f:
+                json.dump(self.meta, f, indent=2, ensure_ascii=False)
+            open(self.data_file, 'ab').close()
+            open(self.index_file, 'ab').close()
+            open(self.config_file, 'ab').close()
+
+        self.m = self.meta['m']
+        self.dtype = np.dtype(self.meta['dtype'])
+        self._data = None
+        self._index = None
+        # 偏移到配置的缓存及configs.jsonl已解析到的位置
+        self._configs = {}
+        self._configs_pos = 0
+
+    def _check_config(self, config: Optional[dict]):
+        """检查配置的结构参数与存储元数据一致"""
+        stored = self.meta.get('config') or {}
+        for key in STRUCTURE_KEYS:
+            if config and key in config and key in stored and config[key] != stored[key]:
+                raise ValueError(f"配置项{key}={config[key]}与存储中的{stored[key]}不一致")
+
+    @contextmanager
+    def _locked(self):
+        """跨进程的排他锁，保证并发追加时偏移读取与写入是原子的"""
+        with open(self.lock_file, 'a+b') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.index_file) // INDEX_DTYPE.itemsize
+
+    def _to_field_array(self, array: np.ndarray) -> np.ndarray:
+        """检查取值范围并转换为存储类型"""
+        array = np.asarray(array)
+        if array.size and (array.min() < 0 or array.max() > np.iinfo(self.dtype).max):
+            raise ValueError(f"元素取值超出{self.dtype}的表示范围")
+        return np.ascontiguousarray(array, dtype=self.dtype)
+
+    def append(self, public_key: np.ndarray, error_vector: np.ndarray,
+               config: Optional[dict] = None) -> int:
+        """
+        追加一个实例
+
+        Args:
+            public_key: 公钥矩阵
+            error_vector: 错误向量
+            config (dict): 该实例的完整配置（如seed、instance_id），与索引逐条对应保存
+
+        Returns:
+            int: 新实例的编号
+        """
+        pk = self._to_field_array(public_key)
+        ev = self._to_field_array(error_vector).reshape(-1)
+        if pk.ndim != 2:
+            raise ValueError("公钥必须是二维矩阵")
+        self._check_config(config)
+
+        with self._locked():
+            offset = os.path.getsize(self.data_file)
+            # 配置记录以数据偏移为键、先于索引写入，中断写入留下的孤立记录不会错位
+            with open(self.config_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'offset': offset, 'config': config}, ensure_ascii=False) + "\n")
+
+            with open(self.data_file, 'ab') as f:
+                f.write(pk.tobytes())
+                f.write(ev.tobytes())
+
+            record = np.array([(offset, pk.shape[0], pk.shape[1], ev.shape[0])], dtype=INDEX_DTYPE)
+            with open(self.index_file, 'ab') as f:
+                f.write(record.tobytes())
+            index = len(self) - 1
+
+        # 文件已增长，下次读取时重新映射
+        self._data = None
+        self._index = None
+        return index
+
+    def _mapped(self) -> Tuple[np.ndarray, np.ndarray]:
+        """按需建立数据文件和索引文件的只读内存映射"""
+        if self._index is None or len(self._index) != len(self):
+            if len(self) == 0:
+                self._index = np.zeros(0, dtype=INDEX_DTYPE)
+                self._data = np.zeros(0, dtype=np.uint8)
+            else:
+                self._index = np.memmap(self.index_file, dtype=INDEX_DTYPE, mode='r')
+                self._data = np.memmap(self.data_file, dtype=np.uint8, mode='r')
+        return self._data, self._index
+
+    def get(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        零拷贝读取第i个实例
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (公钥矩阵, 错误向量)，均为只读视图
+        """
+        data, index = self._mapped()
+        if not -len(index) <= i < len(index):
+            raise IndexError(f"实例编号{i}超出范围")
+        rec = index[i]
+        offset = int(rec['offset'])
+        rows, cols, length = int(rec['rows']), int(rec['cols']), int(rec['length'])
+        pk_bytes = rows * cols * self.dtype.itemsize
+        ev_bytes = length * self.dtype.itemsize
+
+        public_key = data[offset:offset + pk_bytes].view(self.dtype).reshape(rows, cols)
+        error_vector = data[offset + pk_bytes:offset + pk_bytes + ev_bytes].view(self.dtype)
+        return public_key, error_vector
+
+    def _load_configs(self) -> dict:
+        """增量解析configs.jsonl中新追加的完整记录，返回偏移到配置的字典"""
+        if not os.path.exists(self.config_file):
+            return self._configs
+        if os.path.getsize(self.config_file) > self._configs_pos:
+            with open(self.config_file, 'rb') as f:
+                f.seek(self._configs_pos)
+                for line in f:
+                    # 跳过其他进程尚未写完的末行，下次再解析
+                    if not line.endswith(b"\n"):
+                        break
+                    record = json.loads(line)
+                    self._configs[record['offset']] = record['config']
+                    self._configs_pos += len(line)
+        return self._configs
+
+    def config(self, i: int) -> Optional[dict]:
+        """读取第i个实例追加时记录的配置，没有记录时返回None"""
+        _, index = self._mapped()
+        if not -len(index) <= i < len(index):
+            raise IndexError(f"实例编号{i}超出范围")
+        return self._load_configs().get(int(index[i]['offset']))
+
+    def __getitem__(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self.get(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get(i)
@@ -4,9 +4,10 @@
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 import json
 import os
+import numpy as np
 
 
 @dataclass
@@ -18,8 +19,20 @@ class RLCEConfig:
     m: int = 4           # 有限域的指数
     w: int = 4           # 插入的列数
     seed: Optional[int] = None  # 随机数种子
+    instance_id: int = 0         # 实例编号，与seed共同决定该实例的随机数流
     output_dir: str = "output"   # 输出目录
     cnf_file: str = "output.cnf" # CNF输出文件名
+    preprocess: bool = False     # 输出前是否预处理子句
+    verify: bool = False         # 生成后是否用内置求解器验证
+    variants: int = 0            # 共享同一公钥的增量变体数，0表示生成单个实例
+    weight_bounds: Optional[List[int]] = None  # 增量变体的重量上界，默认使用t
+    solvers: Optional[List[str]] = None       # 本地求解器命令行，多个时竞速求解
+    solver_time_limit: Optional[float] = None  # 求解时间上限（秒）
+    solver_memory_limit: Optional[int] = None  # 求解内存上限（MB）
+    cache_dir: Optional[str] = None        # 实例缓存目录
+    cache_max_bytes: Optional[int] = None  # 实例缓存总大小上限（字节）
+    artifact_store: Optional[str] = None  # 批量产物存储目录，设置后不再单独保存.npy文件
+    encoding: str = "bit"  # 编码方式：bit为错误比特上的XOR方程，field为以消息符号为未知量的乘法电路
     
     @property
     def nsym(self) -> int:
@@ -38,21 +51,66 @@ class RLCEConfig:
             raise ValueError("w必须为正数")
         if self.k <= 0:
             raise ValueError("k必须为正数")
+        if self.encoding not in ("bit", "field"):
+            raise ValueError("encoding必须为bit或field")
+        if self.encoding == "field" and self.variants:
+            raise ValueError("field编码不支持增量变体")
+        if self.encoding == "field" and self.artifact_store:
+            # 产物存储只保存公钥和错误向量，无法保存field编码所需的接收向量
+            raise ValueError("field编码不支持产物存储")
+        if self.variants and (self.verify or self.solvers):
+            raise ValueError("增量变体不支持verify与solver选项")
+        if self.variants and self.preprocess:
+            raise ValueError("增量变体不支持预处理")
+        if self.weight_bounds and not self.variants:
+            raise ValueError("weight_bounds仅用于增量变体")
         return True
     
-    def save_to_file(self, filepath: str):
-        """保存配置到文件"""
-        config_dict = {
+    def spawn_generators(self, count: int = 2) -> List[np.random.Generator]:
+        """
+        由seed和instance_id派生相互独立的随机数生成器
+        每个实例的随机数流只取决于(seed, instance_id)，与生成顺序和进程无关
+        
+        Args:
+            count (int): 生成器个数
+            
+        Returns:
+            List[np.random.Generator]: 随机数生成器列表
+        """
+        if self.seed is None:
+            # 记录系统熵，使本次运行可以复现
+            self.seed = np.random.SeedSequence().entropy
+        sequence = np.random.SeedSequence(self.seed, spawn_key=(self.instance_id,))
+        return [np.random.default_rng(child) for child in sequence.spawn(count)]
+    
+    def to_dict(self) -> dict:
+        """转换为可JSON序列化的字典"""
+        return {
             'n': self.n,
             'k': self.k,
             't': self.t,
             'm': self.m,
             'w': self.w,
             'seed': self.seed,
+            'instance_id': self.instance_id,
             'output_dir': self.output_dir,
-            'cnf_file': self.cnf_file
+            'cnf_file': self.cnf_file,
+            'preprocess': self.preprocess,
+            'verify': self.verify,
+            'variants': self.variants,
+            'weight_bounds': self.weight_bounds,
+            'solvers': self.solvers,
+            'solver_time_limit': self.solver_time_limit,
+            'solver_memory_limit': self.solver_memory_limit,
+            'cache_dir': self.cache_dir,
+            'cache_max_bytes': self.cache_max_bytes,
+            'artifact_store': self.artifact_store,
+            'encoding': self.encoding
         }
-        
+    
+    def save_to_file(self, filepath: str):
+        """保存配置到文件"""
+        config_dict = self.to_dict()
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(config_dict, f, indent=2, ensure_ascii=False)
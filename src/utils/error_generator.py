@@ -4,21 +4,19 @@
 """
 
 import numpy as np
-import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 
 class ErrorGenerator:
-    def __init__(self, seed: int = None):
+    def __init__(self, seed: int = None, rng: Optional[np.random.Generator] = None):
         """
         初始化错误向量生成器
         
         Args:
             seed (int): 随机数种子，用于可重现的结果
+            rng (np.random.Generator): 随机数生成器，提供时忽略seed
         """
-        if seed is not None:
-            np.random.seed(seed)
-            random.seed(seed)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
     
     def generate_random_error(self, length: int, max_errors: int) -> np.ndarray:
         """
@@ -34,12 +32,12 @@ class ErrorGenerator:
         error_vector = np.zeros(length, dtype=int)
         
         # 随机选择错误位置
-        num_errors = random.randint(1, min(max_errors, length))
-        error_positions = random.sample(range(length), num_errors)
+        num_errors = int(self.rng.integers(1, min(max_errors, length) + 1))
+        error_positions = self.rng.choice(length, num_errors, replace=False)
         
         # 在错误位置设置非零值
         for pos in error_positions:
-            error_vector[pos] = random.randint(1, 255)  # GF(2^8)中的非零值
+            error_vector[pos] = self.rng.integers(1, 256)  # GF(2^8)中的非零值
         
         return error_vector
     
@@ -58,10 +56,10 @@ class ErrorGenerator:
             raise ValueError("错误重量不能超过向量长度")
         
         error_vector = np.zeros(length, dtype=int)
-        error_positions = random.sample(range(length), weight)
+        error_positions = self.rng.choice(length, weight, replace=False)
         
         for pos in error_positions:
-            error_vector[pos] = random.randint(1, 255)
+            error_vector[pos] = self.rng.integers(1, 256)
         
         return error_vector
     
@@ -83,7 +81,92 @@ class ErrorGenerator:
         error_vector = np.zeros(length, dtype=int)
         
         for i in range(burst_start, burst_start + burst_length):
-            if random.random() < 0.7:  # 70%概率出现错误
-                error_vector[i] = random.randint(1, 255)
+            if self.rng.random() < 0.7:  # 70%概率出现错误
+                error_vector[i] = self.rng.integers(1, 256)
         
-        return error_vector 
\ No newline at end of file
+        return error_vector 
+    
+    def _random_field_values(self, shape: Tuple[int, ...], m: int) -> np.ndarray:
+        """生成GF(2^m)中的随机非零元素"""
+        return self.rng.integers(1, 1 << m, size=shape, dtype=np.int64)
+    
+    def generate_weight_t_errors(self, batch: int, length: int, weight: int, m: int = 8) -> np.ndarray:
+        """
+        批量生成指定重量的错误向量
+        
+        Args:
+            batch (int): 错误向量个数
+            length (int): 错误向量的长度
+            weight (int): 错误向量的重量（非零元素个数）
+            m (int): 有限域指数，非零元素取自[1, 2^m-1]
+            
+        Returns:
+            np.ndarray: 形状为(batch, length)的错误向量矩阵
+        """
+        if weight > length:
+            raise ValueError("错误重量不能超过向量长度")
+        
+        error_vectors = np.zeros((batch, length), dtype=np.int64)
+        if weight == 0 or batch == 0:
+            return error_vectors
+        
+        # 每行取随机键值最小的weight个位置
+        keys = self.rng.random((batch, length))
+        positions = np.argpartition(keys, weight - 1, axis=1)[:, :weight]
+        np.put_along_axis(error_vectors, positions,
+                          self._random_field_values((batch, weight), m), axis=1)
+        return error_vectors
+    
+    def generate_random_errors(self, batch: int, length: int, max_errors: int, m: int = 8) -> np.ndarray:
+        """
+        批量生成随机错误向量，每个向量的错误数在[1, max_errors]中均匀选取
+        
+        Args:
+            batch (int): 错误向量个数
+            length (int): 错误向量的长度
+            max_errors (int): 最大错误数量
+            m (int): 有限域指数，非零元素取自[1, 2^m-1]
+            
+        Returns:
+            np.ndarray: 形状为(batch, length)的错误向量矩阵
+        """
+        max_errors = min(max_errors, length)
+        if max_errors <= 0 or batch == 0:
+            return np.zeros((batch, length), dtype=np.int64)
+        
+        num_errors = self.rng.integers(1, max_errors + 1, size=batch)
+        keys = self.rng.random((batch, length))
+        
+        # 第num_errors小的键值作为阈值，键值不超过阈值的位置出错
+        smallest = np.partition(keys, max_errors - 1, axis=1)[:, :max_errors]
+        smallest.sort(axis=1)
+        threshold = smallest[np.arange(batch), num_errors - 1]
+        mask = keys <= threshold[:, None]
+        
+        return np.where(mask, self._random_field_values((batch, length), m), 0)
+    
+    def generate_burst_errors(self, batch: int, length: int, burst_start: int, burst_length: int,
+                              m: int = 8) -> np.ndarray:
+        """
+        批量生成突发错误向量
+        
+        Args:
+            batch (int): 错误向量个数
+            length (int): 错误向量的长度
+            burst_start (int): 突发错误开始位置
+            burst_length (int): 突发错误长度
+            m (int): 有限域指数，非零元素取自[1, 2^m-1]
+            
+        Returns:
+            np.ndarray: 形状为(batch, length)的错误向量矩阵
+        """
+        if burst_start + burst_length > length:
+            raise ValueError("突发错误超出向量范围")
+        
+        error_vectors = np.zeros((batch, length), dtype=np.int64)
+        shape = (batch, burst_length)
+        mask = self.rng.random(shape) < 0.7  # 70%概率出现错误
+        error_vectors[:, burst_start:burst_start + burst_length] = np.where(
+            mask, self._random_field_values(shape, m), 0
+        )
+        return error_vectors
@@ -0,0 +1,213 @@
+"""
+实例缓存模块
+以配置哈希为键缓存生成的CNF及相关产物，命中时直接复用
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Optional
+
+# 不影响实例内容的配置项（输出位置与后续处理）
+NON_KEY_FIELDS = (
+    'output_dir', 'cnf_file', 'artifact_store', 'verify',
+    'solvers', 'solver_time_limit', 'solver_memory_limit',
+    'cache_dir', 'cache_max_bytes',
+)
+
+_tool_digest = None
+
+
+def tool_digest() -> str:
+    """工具源码的摘要，作为工具版本参与缓存键计算，代码变化时缓存自动失效"""
+    global _tool_digest
+    if _tool_digest is None:
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(src_dir):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(root, name)
+                    digest.update(os.path.relpath(path, src_dir).encode('utf-8'))
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+        _tool_digest = digest.hexdigest()
+    return _tool_digest
+
+
+def file_digest(path: str) -> str:
+    """计算文件的SHA-256摘要"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class InstanceCache:
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None):
+        """
+        初始化实例缓存
+
+        Args:
+            cache_dir (str): 缓存目录
+            max_bytes (int): 缓存总大小上限（字节），超出时按最近最少使用淘汰
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(config) -> str:
+        """
+        计算配置的缓存键
+
+        Args:
+            config: RLCEConfig对象，seed为None时实例不可复现，调用前应先确定seed
+
+        Returns:
+            str: 十六进制缓存键
+        """
+        payload = {name: value for name, value in dataclasses.asdict(config).items()
+                   if name not in NON_KEY_FIELDS}
+        payload['tool'] = tool_digest()
+        text = json.dumps(payload, sort_keys=True)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _read_manifest(self, key: str) -> Optional[dict]:
+        path = os.path.join(self._entry_dir(key), self.MANIFEST_FILE)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, entry_dir: str, manifest: dict):
+        path = os.path.join(entry_dir, self.MANIFEST_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, path)
+
+    def remove(self, key: str):
+        """删除缓存条目"""
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def lookup(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        查找缓存条目并校验完整性，损坏的条目会被删除
+
+        Returns:
+            Dict[str, str]: 产物角色到缓存文件路径的映射，未命中时返回None
+        """
+        manifest = self._read_manifest(key)
+        if manifest is None:
+            return None
+        entry_dir = self._entry_dir(key)
+        files = {}
+        for role, info in manifest['files'].items():
+            path = os.path.join(entry_dir, info['name'])
+            if not os.path.exists(path) or os.path.getsize(path) != info['size'] \
+                    or file_digest(path) != info['digest']:
+                self.remove(key)
+                return None
+            files[role] = path
+        manifest['last_access'] = time.time()
+        self._write_manifest(entry_dir, manifest)
+        return files
+
+    def restore(self, key: str, destinations: Dict[str, str]) -> bool:
+        """
+        将缓存的产物复制到目标位置
+
+        Args:
+            key (str): 缓存键
+            destinations: 产物角色到目标路径的映射
+
+        Returns:
+            bool: 是否命中
+        """
+        files = self.lookup(key)
+        if files is None:
+            return False
+        for role, path in files.items():
+            if role in destinations:
+                shutil.copyfile(path, destinations[role])
+        return True
+
+    def store(self, key: str, files: Dict[str, str]):
+        """
+        保存产物到缓存
+
+        Args:
+            key (str): 缓存键
+            files: 产物角色到源文件路径的映射
+        """
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+        manifest = {'files': {}, 'created': time.time(), 'last_access': time.time()}
+        for role, path in files.items():
+            shutil.copyfile(path, os.path.join(tmp_dir, role))
+            manifest['files'][role] = {
+                'name': role,
+                'size': os.path.getsize(path),
+                'digest': file_digest(path),
+            }
+        self._write_manifest(tmp_dir, manifest)
+
+        # 其他进程已存入有效条目时直接复用，不覆盖
+        if self._read_manifest(key) is not None and self.lookup(key) is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self.remove(key)
+        try:
+            os.replace(tmp_dir, self._entry_dir(key))
+        except OSError:
+            # 并发写入同一键时目标目录可能已被其他进程创建
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if self.lookup(key) is None:
+                raise
+            return
+        self.evict(keep=key)
+
+    def entries(self) -> Dict[str, dict]:
+        """所有有效缓存条目的清单"""
+        result = {}
+        for key in os.listdir(self.cache_dir):
+            if key.startswith('.'):
+                continue
+            manifest = self._read_manifest(key)
+            if manifest is not None:
+                result[key] = manifest
+        return result
+
+    @staticmethod
+    def _entry_size(manifest: dict) -> int:
+        return sum(info['size'] for info in manifest['files'].values())
+
+    def total_size(self) -> int:
+        """缓存产物的总大小（字节）"""
+        return sum(self._entry_size(m) for m in self.entries().values())
+
+    def evict(self, keep: Optional[str] = None):
+        """按最近最少使用淘汰条目，直至总大小不超过上限"""
+        if self.max_bytes is None:
+            return
+        entries = self.entries()
+        total = sum(self._entry_size(m) for m in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entry_size(entries[key])
+            self.remove(key)
@@ -0,0 +1,261 @@
+"""
+SAT求解器运行模块
+并行调用本地求解器程序，支持时间/内存限制以及多求解器竞速
+"""
+
+import json
+import os
+import shlex
+import sys
+import tempfile
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from subprocess import Popen, STDOUT
+from typing import List, Optional, Sequence, Tuple, Union
+from .variable_map import VariableMap
+
+VARIABLE_MAP_SUFFIX = ".vmap"
+
+try:
+    import resource
+except ImportError:  # Windows下不支持内存限制
+    resource = None
+
+# 在子进程中设置地址空间上限后exec求解器；不使用preexec_fn，以便在工作线程中安全启动
+_MEMORY_LIMIT_SHIM = (
+    "import os, resource, sys; limit = int(sys.argv[1]); "
+    "resource.setrlimit(resource.RLIMIT_AS, (limit, limit)); "
+    "os.execvp(sys.argv[2], sys.argv[2:])"
+)
+
+
+@dataclass
+class SolverSpec:
+    """求解器配置"""
+    name: str
+    command: List[str]   # 命令行，含{cnf}占位符时替换为CNF路径，否则追加在末尾
+
+    @classmethod
+    def from_string(cls, command: str, name: Optional[str] = None) -> 'SolverSpec':
+        """从命令行字符串创建"""
+        args = shlex.split(command)
+        return cls(name or os.path.basename(args[0]), args)
+
+    @classmethod
+    def builtin(cls) -> 'SolverSpec':
+        """内置的GF(2)感知参考求解器"""
+        script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              'core', 'gf2_solver.py')
+        return cls('builtin', [sys.executable, script])
+
+    def build_command(self, cnf_file: str) -> List[str]:
+        if any('{cnf}' in arg for arg in self.command):
+            return [arg.replace('{cnf}', cnf_file) for arg in self.command]
+        return self.command + [cnf_file]
+
+
+@dataclass
+class SolverInstance:
+    """待求解的实例"""
+    cnf_file: str
+    m: Optional[int] = None          # 有限域指数，用于将模型还原为错误向量
+    length: Optional[int] = None     # 错误向量长度(n+w)
+    variable_map: Optional[str] = None  # 变量映射边车文件路径
+
+    @classmethod
+    def from_cnf(cls, cnf_file: str) -> 'SolverInstance':
+        """根据CNF文件旁的变量映射边车文件或config.json补全参数"""
+        sidecar = cnf_file + VARIABLE_MAP_SUFFIX
+        if os.path.exists(sidecar):
+            return cls(cnf_file, variable_map=sidecar)
+        config_file = os.path.join(os.path.dirname(cnf_file), "config.json")
+        if os.path.exists(config_file):
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            return cls(cnf_file, config['m'], config['n'] + config['w'])
+        return cls(cnf_file)
+
+    def decode(self, model: Sequence[int]) -> Optional[np.ndarray]:
+        """将模型还原为错误向量，缺少布局信息时返回None"""
+        if self.variable_map:
+            return VariableMap.load(self.variable_map).decode(model)
+        if self.m and self.length:
+            return model_to_error_vector(model, self.m, self.length)
+        return None
+
+
+@dataclass
+class RunResult:
+    """一次求解器运行的结果"""
+    solver: str
+    cnf_file: str
+    status: str                      # SAT / UNSAT / UNKNOWN / TIMEOUT / ERROR
+    time: float = 0.0
+    returncode: Optional[int] = None
+    model: Optional[List[int]] = None
+    error_vector: Optional[np.ndarray] = None
+    output: str = field(default="", repr=False)
+
+
+def is_incremental_cnf(cnf_file: str) -> bool:
+    """判断文件是否为iCNF格式（p inccnf）"""
+    with open(cnf_file, 'r') as f:
+        for line in f:
+            if line.startswith('p '):
+                return line.split()[1:2] == ['inccnf']
+            if line.strip() and not line.startswith('c'):
+                break
+    return False
+
+
+def parse_solver_output(output: str, returncode: Optional[int]) -> Tuple[str, Optional[List[int]]]:
+    """
+    解析SAT竞赛格式的求解器输出，只接受单个结果
+
+    Returns:
+        Tuple: (状态, 模型文字列表)
+    """
+    status = None
+    model = []
+    for line in output.splitlines():
+        if line.startswith('s '):
+            if status is not None:
+                raise ValueError("求解器输出包含多个结果，增量实例需逐个变体求解")
+            answer = line[2:].strip()
+            if answer == 'SATISFIABLE':
+                status = 'SAT'
+            elif answer == 'UNSATISFIABLE':
+                status = 'UNSAT'
+            else:
+                status = 'UNKNOWN'
+        elif line.startswith('v '):
+            model.extend(int(x) for x in line[2:].split() if x != '0')
+    if status is None:
+        status = {10: 'SAT', 20: 'UNSAT'}.get(returncode, 'UNKNOWN')
+    return status, (model if status == 'SAT' else None)
+
+
+def model_to_error_vector(model: Sequence[int], m: int, length: int) -> np.ndarray:
+    """按默认变量布局（位置优先、低位在前）将模型还原为错误向量"""
+    return VariableMap(m, length).decode(model)
+
+
+class SolverRunner:
+    POLL_INTERVAL = 0.01
+
+    def __init__(self, solvers: Sequence[Union[SolverSpec, str]],
+                 time_limit: Optional[float] = None,
+                 memory_limit: Optional[int] = None,
+                 max_workers: Optional[int] = None):
+        """
+        初始化求解器运行器
+
+        Args:
+            solvers: 求解器配置或命令行字符串列表
+            time_limit (float): 每个实例的时间上限（秒）
+            memory_limit (int): 每个求解器进程的内存上限（MB）
+            max_workers (int): 并行求解的实例数
+        """
+        if not solvers:
+            raise ValueError("至少需要配置一个求解器")
+        self.solvers = [s if isinstance(s, SolverSpec) else SolverSpec.from_string(s)
+                        for s in solvers]
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _build_command(self, solver: SolverSpec, cnf_file: str) -> List[str]:
+        """求解器命令行，设置内存上限时经包装脚本启动"""
+        command = solver.build_command(cnf_file)
+        if self.memory_limit and resource is not None:
+            limit = self.memory_limit * 1024 * 1024
+            command = [sys.executable, '-c', _MEMORY_LIMIT_SHIM, str(limit)] + command
+        return command
+
+    def _launch(self, solver: SolverSpec, cnf_file: str):
+        output = tempfile.TemporaryFile(mode='w+')
+        proc = Popen(self._build_command(solver, cnf_file), stdout=output, stderr=STDOUT)
+        return proc, output
+
+    @staticmethod
+    def _kill(proc: Popen):
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    def run_portfolio(self, instance: Union[SolverInstance, str],
+                      solvers: Optional[Sequence[SolverSpec]] = None) -> RunResult:
+        """
+        让多个求解器竞速求解同一实例，第一个得出结论的求解器胜出，其余进程被终止
+
+        Args:
+            instance: 实例或CNF文件路径
+            solvers: 参与竞速的求解器，默认使用全部已配置求解器
+
+        Returns:
+            RunResult: 胜出求解器的结果；均未得出结论时返回最后的结果
+        """
+        if isinstance(instance, str):
+            instance = SolverInstance.from_cnf(instance)
+        if is_incremental_cnf(instance.cnf_file):
+            raise ValueError(f"求解器运行器不支持iCNF文件: {instance.cnf_file}")
+        solvers = list(solvers or self.solvers)
+
+        start = time.time()
+        running = {}
+        last = None
+        for i, solver in enumerate(solvers):
+            try:
+                running[i] = (solver, *self._launch(solver, instance.cnf_file))
+            except OSError as e:
+                last = RunResult(solver.name, instance.cnf_file, 'ERROR', output=str(e))
+
+        try:
+            while running:
+                elapsed = time.time() - start
+                if self.time_limit is not None and elapsed > self.time_limit:
+                    names = ', '.join(solver.name for solver, _, _ in running.values())
+                    return RunResult(names, instance.cnf_file, 'TIMEOUT', elapsed)
+                for i, (solver, proc, output) in list(running.items()):
+                    if proc.poll() is None:
+                        continue
+                    del running[i]
+                    output.seek(0)
+                    text = output.read()
+                    output.close()
+                    status, model = parse_solver_output(text, proc.returncode)
+                    last = RunResult(solver.name, instance.cnf_file, status, time.time() - start,
+                                     proc.returncode, model, output=text)
+                    if status in ('SAT', 'UNSAT'):
+                        if model is not None:
+                            last.error_vector = instance.decode(model)
+                        return last
+                time.sleep(self.POLL_INTERVAL)
+            return last
+        finally:
+            for solver, proc, output in running.values():
+                self._kill(proc)
+                output.close()
+
+    def run_instance(self, instance: Union[SolverInstance, str],
+                     solver: Optional[SolverSpec] = None) -> RunResult:
+        """使用单个求解器（默认第一个）求解实例"""
+        return self.run_portfolio(instance, [solver or self.solvers[0]])
+
+    def run_batch(self, instances: Sequence[Union[SolverInstance, str]],
+                  portfolio: bool = False) -> List[RunResult]:
+        """
+        并行求解多个实例
+
+        Args:
+            instances: 实例或CNF文件路径列表
+            portfolio (bool): 是否对每个实例进行多求解器竞速
+
+        Returns:
+            List[RunResult]: 与输入顺序一致的结果列表
+        """
+        run = self.run_portfolio if portfolio else self.run_instance
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(run, instances))
@@ -0,0 +1,155 @@
+"""
+变量映射模块
+以紧凑的二进制边车文件记录CNF变量布局，并将求解器模型解码为错误向量
+"""
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+MAGIC = b'RLVM'
+VERSION = 1
+
+# 变量块类型，编号即在文件中的存储值
+BLOCK_KINDS = ('error', 'auxiliary', 'cardinality', 'selector', 'symbol', 'product')
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u2'),
+    ('m', '<u2'),
+    ('length', '<u4'),
+    ('num_vars', '<u4'),
+    ('num_original_vars', '<u4'),
+    ('block_count', '<u4'),
+    ('flags', '<u4'),
+])
+
+BLOCK_DTYPE = np.dtype([
+    ('kind', 'u1'),
+    ('start', '<u4'),
+    ('count', '<u4'),
+])
+
+FLAG_REMAPPED = 1
+
+
+class VariableMap:
+    def __init__(self, m: int, length: int, num_vars: Optional[int] = None,
+                 blocks: Optional[Sequence[Tuple[str, int, int]]] = None,
+                 variable_map: Optional[np.ndarray] = None,
+                 fixed: Optional[np.ndarray] = None):
+        """
+        初始化变量映射
+
+        Args:
+            m (int): 有限域指数
+            length (int): 错误向量长度(n+w)
+            num_vars (int): CNF中的变量个数
+            blocks: 原始编号下的变量块列表(类型, 起始编号, 个数)，默认只有错误比特
+            variable_map: 预处理时原始编号到CNF编号的映射，0表示已消去
+            fixed: 预处理时原始变量的固定取值，1为真、-1为假、0未固定
+        """
+        self.m = m
+        self.length = length
+        self.blocks = list(blocks) if blocks else [('error', 1, m * length)]
+        self.num_original_vars = max(start + count - 1 for _, start, count in self.blocks)
+        self.num_vars = num_vars if num_vars is not None else self.num_original_vars
+        self.variable_map = variable_map
+        self.fixed = fixed
+        # 错误比特变量按位置优先、低位在前排列
+        self._powers = np.int64(1) << np.arange(m, dtype=np.int64)
+
+    @classmethod
+    def from_converter(cls, converter) -> 'VariableMap':
+        """根据已完成转换的CNFConverter生成变量映射"""
+        variable_map = fixed = None
+        pre = converter.preprocessor
+        if pre is not None:
+            variable_map = pre.variable_map.copy()
+            fixed = np.zeros(pre.num_vars + 1, dtype=np.int8)
+            for v, value in pre.fixed_assignments.items():
+                fixed[v] = 1 if value else -1
+        return cls(converter.m, converter.n + converter.w, converter.variable_count,
+                   converter.variable_blocks, variable_map, fixed)
+
+    def block(self, kind: str) -> List[Tuple[int, int]]:
+        """返回指定类型的所有变量块(起始编号, 个数)"""
+        return [(start, count) for k, start, count in self.blocks if k == kind]
+
+    def save(self, path: str):
+        """写入二进制边车文件"""
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['m'] = self.m
+        header['length'] = self.length
+        header['num_vars'] = self.num_vars
+        header['num_original_vars'] = self.num_original_vars
+        header['block_count'] = len(self.blocks)
+        header['flags'] = FLAG_REMAPPED if self.variable_map is not None else 0
+
+        blocks = np.array([(BLOCK_KINDS.index(kind), start, count)
+                           for kind, start, count in self.blocks], dtype=BLOCK_DTYPE)
+        with open(path, 'wb') as f:
+            f.write(header.tobytes())
+            f.write(blocks.tobytes())
+            if self.variable_map is not None:
+                f.write(self.variable_map.astype('<u4').tobytes())
+                f.write(self.fixed.astype(np.int8).tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'VariableMap':
+        """读取二进制边车文件"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        header = np.frombuffer(data, dtype=HEADER_DTYPE, count=1)[0]
+        if header['magic'] != MAGIC:
+            raise ValueError(f"不是有效的变量映射文件: {path}")
+        if header['version'] != VERSION:
+            raise ValueError(f"不支持的变量映射文件版本: {header['version']}")
+
+        offset = HEADER_DTYPE.itemsize
+        count = int(header['block_count'])
+        raw_blocks = np.frombuffer(data, dtype=BLOCK_DTYPE, count=count, offset=offset)
+        blocks = [(BLOCK_KINDS[b['kind']], int(b['start']), int(b['count'])) for b in raw_blocks]
+        offset += count * BLOCK_DTYPE.itemsize
+
+        variable_map = fixed = None
+        if header['flags'] & FLAG_REMAPPED:
+            size = int(header['num_original_vars']) + 1
+            variable_map = np.frombuffer(data, dtype='<u4', count=size, offset=offset).astype(np.int64)
+            offset += size * 4
+            fixed = np.frombuffer(data, dtype=np.int8, count=size, offset=offset)
+        return cls(int(header['m']), int(header['length']), int(header['num_vars']),
+                   blocks, variable_map, fixed)
+
+    def original_values(self, model: Sequence[int]) -> np.ndarray:
+        """
+        将模型（真文字列表或带符号文字列表）展开为原始编号下的布尔赋值
+
+        Returns:
+            np.ndarray: 长度为原始变量数+1的布尔数组，下标0不使用
+        """
+        lits = np.asarray(model, dtype=np.int64)
+        values = np.zeros(self.num_vars + 1, dtype=bool)
+        values[lits[(lits > 0) & (lits <= self.num_vars)]] = True
+        if self.variable_map is None:
+            out = np.zeros(self.num_original_vars + 1, dtype=bool)
+            size = min(len(values), len(out))
+            out[:size] = values[:size]
+            return out
+        out = values[self.variable_map]
+        out[self.variable_map == 0] = False
+        out[self.fixed == 1] = True
+        return out
+
+    def decode(self, model: Sequence[int], kind: str = 'error') -> np.ndarray:
+        """将求解器模型解码为GF(2^m)向量，默认解码错误向量，kind='symbol'时解码消息符号"""
+        values = self.original_values(model)
+        start, count = self.block(kind)[0]
+        bits = values[start:start + count].reshape(-1, self.m)
+        return bits.astype(np.int64) @ self._powers
+
+    def decode_output(self, output: str) -> np.ndarray:
+        """直接解码求解器输出中的v行"""
+        text = " ".join(line[1:] for line in output.splitlines() if line.startswith('v'))
+        return self.decode(np.array(text.split(), dtype=np.int64))
@@ -0,0 +1,151 @@
+"""
+产物存储模块测试
+"""
+
+import unittest
+import multiprocessing
+import tempfile
+import numpy as np
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.artifact_store import ArtifactStore, field_dtype
+from utils.config import RLCEConfig
+from main import RLCEToCNF
+
+
+def _append_worker(path, worker, count):
+    """并发追加测试的子进程：数据内容由(worker, i)唯一确定"""
+    store = ArtifactStore(path)
+    for i in range(count):
+        pk = np.full((2, 3), worker)
+        ev = np.array([worker, i % 16, i // 16])
+        store.append(pk, ev, config={'worker': worker, 'i': i})
+
+
+class TestArtifactStore(unittest.TestCase):
+    def setUp(self):
+        """测试设置"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "store")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_field_dtype(self):
+        """测试存储类型选择"""
+        self.assertEqual(field_dtype(4), np.uint8)
+        self.assertEqual(field_dtype(8), np.uint8)
+        self.assertEqual(field_dtype(10).itemsize, 2)
+        self.assertEqual(field_dtype(20).itemsize, 4)
+
+    def test_append_and_read(self):
+        """测试追加与零拷贝读取"""
+        store = ArtifactStore(self.path, m=4)
+        pk1 = np.arange(14).reshape(2, 7)
+        ev1 = np.array([0, 3, 0, 0, 9, 0, 0])
+        pk2 = np.full((3, 5), 15)
+        ev2 = np.array([1, 0, 0, 0, 2])
+        self.assertEqual(store.append(pk1, ev1), 0)
+        self.assertEqual(store.append(pk2, ev2), 1)
+
+        # 重新打开后读取
+        reopened = ArtifactStore(self.path)
+        self.assertEqual(len(reopened), 2)
+        pk, ev = reopened[1]
+        self.assertEqual(pk.dtype, np.uint8)
+        np.testing.assert_array_equal(pk, pk2)
+        np.testing.assert_array_equal(ev, ev2)
+        pk, ev = reopened[0]
+        np.testing.assert_array_equal(pk, pk1)
+        np.testing.assert_array_equal(ev, ev1)
+        self.assertIsInstance(pk.base, np.ndarray)
+
+    def test_invalid_values(self):
+        """测试越界取值和参数不一致"""
+        store = ArtifactStore(self.path, m=4)
+        with self.assertRaises(ValueError):
+            store.append(np.array([[256]]), np.array([0]))
+        with self.assertRaises(ValueError):
+            ArtifactStore(self.path, m=5)
+        with self.assertRaises(IndexError):
+            store.get(0)
+
+    def test_instance_configs(self):
+        """测试逐实例配置记录与结构参数检查"""
+        structure = {'n': 5, 'k': 2, 't': 1, 'm': 4, 'w': 2}
+        store = ArtifactStore(self.path, m=4, config=structure)
+        pk = np.ones((2, 7), dtype=int)
+        ev = np.zeros(7, dtype=int)
+        store.append(pk, ev, config=dict(structure, seed=11, instance_id=0))
+        store.append(pk, ev)
+        store.append(pk, ev, config=dict(structure, seed=11, instance_id=2))
+
+        reopened = ArtifactStore(self.path)
+        self.assertEqual(reopened.config(0)['seed'], 11)
+        self.assertIsNone(reopened.config(1))
+        self.assertEqual(reopened.config(-1)['instance_id'], 2)
+
+        # 已缓存配置的存储能读到其他句柄随后追加的记录
+        store.append(pk, ev, config=dict(structure, seed=12, instance_id=3))
+        self.assertEqual(reopened.config(3)['seed'], 12)
+        self.assertEqual(reopened.config(0)['seed'], 11)
+
+        # 结构参数不同的实例不能混入同一存储
+        with self.assertRaises(ValueError):
+            ArtifactStore(self.path, m=4, config=dict(structure, n=7))
+        with self.assertRaises(ValueError):
+            store.append(pk, ev, config=dict(structure, t=2))
+        self.assertEqual(len(store), 4)
+
+    def test_concurrent_append(self):
+        """测试多进程并发追加时每条记录的数据与其配置一致"""
+        ArtifactStore(self.path, m=4)
+        workers, count = 6, 40
+        processes = [multiprocessing.Process(target=_append_worker, args=(self.path, w, count))
+                     for w in range(workers)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+            self.assertEqual(p.exitcode, 0)
+
+        store = ArtifactStore(self.path)
+        self.assertEqual(len(store), workers * count)
+        seen = set()
+        for i in range(len(store)):
+            config = store.config(i)
+            pk, ev = store[i]
+            worker, j = config['worker'], config['i']
+            np.testing.assert_array_equal(pk, np.full((2, 3), worker))
+            np.testing.assert_array_equal(ev, [worker, j % 16, j // 16])
+            seen.add((worker, j))
+        self.assertEqual(len(seen), workers * count)
+
+    def test_family_records(self):
+        """测试增量实例族在存储中逐变体记录，每条记录各带一份公钥副本"""
+        output_dir = os.path.join(self.tmpdir.name, "output")
+        os.makedirs(output_dir)
+        config = RLCEConfig(n=15, k=7, t=2, m=4, w=4, seed=5, variants=3,
+                            output_dir=output_dir, artifact_store=self.path)
+        converter = RLCEToCNF(config)
+        converter.run_family()
+
+        store = ArtifactStore(self.path)
+        self.assertEqual(len(store), 3)
+        for i in range(3):
+            pk, ev = store[i]
+            np.testing.assert_array_equal(pk, converter.public_key)
+            np.testing.assert_array_equal(ev, converter.error_vectors[i])
+            self.assertEqual(store.config(i)['variant'], i)
+            self.assertEqual(store.config(i)['seed'], 5)
+        # 公钥重复保存：数据文件大小为变体数乘以(公钥+错误向量)
+        pk_bytes = converter.public_key.size + converter.error_vectors[0].size
+        self.assertEqual(os.path.getsize(store.data_file), 3 * pk_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
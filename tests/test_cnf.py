@@ -0,0 +1,294 @@
+"""
+CNF转换相关模块测试
+"""
+
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.cnf_converter import CNFConverter, matrix_to_csr
+from core.gf_circuits import eliminate_common_subexpressions
+from core.cnf_preprocessor import CNFPreprocessor
+from core.gf2_solver import GF2Solver, verify_instance, error_vector_to_bits, read_icnf
+
+
+class TestCNFPreprocessor(unittest.TestCase):
+    def test_duplicates_and_tautologies(self):
+        """测试去重与重言式删除"""
+        pre = CNFPreprocessor(3)
+        clauses = pre.process([(1, 2), (2, 1), (1, -1, 3), (2, 2, 3)])
+        self.assertEqual(sorted(clauses), [(1, 2), (2, 3)])
+
+    def test_unit_propagation(self):
+        """测试单元传播与重新编号"""
+        pre = CNFPreprocessor(4)
+        clauses = pre.process([(1,), (-1, 2), (-2, 3, 4), (1, 4)])
+        self.assertEqual(pre.fixed_assignments, {1: True, 2: True})
+        self.assertEqual(clauses, [(1, 2)])
+        self.assertEqual(pre.variable_map[3], 1)
+        self.assertEqual(pre.variable_map[4], 2)
+        self.assertEqual(pre.variable_map[1], 0)
+        self.assertEqual(pre.new_variable_count, 2)
+
+    def test_conflict(self):
+        """测试单元冲突"""
+        pre = CNFPreprocessor(2)
+        clauses = pre.process([(1,), (-1, 2), (-2,)])
+        self.assertTrue(pre.unsatisfiable)
+        self.assertEqual(clauses, [()])
+
+    def test_subsumption(self):
+        """测试包含消去"""
+        pre = CNFPreprocessor(4)
+        clauses = pre.process([(1, 2, 3), (1, 2), (-1, 3, 4), (3, -1)])
+        self.assertEqual(sorted(clauses), [(-1, 3), (1, 2)])
+
+
+class TestCNFConverter(unittest.TestCase):
+    def setUp(self):
+        """测试设置"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.tmpdir.name, "test.cnf")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _read_clauses(self):
+        with open(self.output_file) as f:
+            lines = f.read().splitlines()
+        return lines[0], [tuple(int(x) for x in line.split()[:-1]) for line in lines[1:]]
+
+    def test_xor_encoding(self):
+        """测试小型XOR编码与奇偶性一致"""
+        for l in range(1, 5):
+            for result in (0, 1):
+                converter = CNFConverter(1, l, 0, 1, self.output_file)
+                converter.clear_output_file()
+                converter.generate_xor_cnf(list(range(1, l + 1)), result)
+                converter.write_cnf_header()
+                _, clauses = self._read_clauses()
+                for bits in range(1 << l):
+                    value = lambda lit: bool(bits >> (abs(lit) - 1) & 1) == (lit > 0)
+                    satisfied = all(any(value(lit) for lit in c) for c in clauses)
+                    self.assertEqual(satisfied, bin(bits).count('1') % 2 == result)
+
+    def test_csr_conversion(self):
+        """测试CSR表示及按重量分组的批量转换"""
+        matrix = np.array([[0, 1, 0, 1], [0, 0, 0, 0], [1, 1, 1, 0], [0, 0, 1, 0]])
+        indptr, indices = matrix_to_csr(matrix)
+        np.testing.assert_array_equal(indptr, [0, 2, 2, 5, 6])
+        np.testing.assert_array_equal(indices, [1, 3, 0, 1, 2, 2])
+
+        vector = np.array([1, 0, 0, 1])
+        converter = CNFConverter(1, 2, 2, 1, self.output_file)
+        converter.convert_csr_to_cnf(indptr, indices, vector)
+        converter.write_cnf_header()
+        _, clauses = self._read_clauses()
+        self.assertEqual(converter.xor_constraints, [([2, 4], 1), ([1, 2, 3], 0), ([3], 1)])
+
+        # 批量生成的子句与逐行生成的子句集合一致
+        expected = CNFConverter(1, 2, 2, 1, os.path.join(self.tmpdir.name, "rows.cnf"))
+        expected.clear_output_file()
+        for variables, result in converter.xor_constraints:
+            expected.generate_xor_cnf(variables, result)
+        with open(expected.output_file) as f:
+            rows = [frozenset(int(x) for x in line.split()[:-1]) for line in f]
+        self.assertEqual(sorted(map(sorted, map(frozenset, clauses))), sorted(map(sorted, rows)))
+
+    def test_large_xor(self):
+        """测试大型XOR通过辅助变量分解"""
+        converter = CNFConverter(1, 7, 0, 1, self.output_file)
+        converter.convert_matrix_to_cnf(np.ones((1, 7), dtype=int), np.array([1]))
+        converter.write_cnf_header()
+        self.assertEqual(converter.variable_count, 9)
+        self.assertEqual(converter.variable_blocks, [('error', 1, 7), ('auxiliary', 8, 2)])
+
+        # 固定前7个变量后，CNF可满足当且仅当奇偶性为1
+        _, clauses = self._read_clauses()
+        for bits in range(1 << 7):
+            units = [[v if bits >> (v - 1) & 1 else -v] for v in range(1, 8)]
+            result = GF2Solver(9, clauses + units).solve()
+            self.assertEqual(result.status == 'SAT', bin(bits).count('1') % 2 == 1)
+
+    def test_preprocessed_output(self):
+        """测试预处理后的输出文件"""
+        matrix = np.array([[1, 0, 0, 0], [1, 1, 0, 0], [1, 1, 0, 0], [0, 0, 1, 1]])
+        vector = np.array([1, 0, 0, 1])
+
+        plain = CNFConverter(1, 2, 2, 1, self.output_file)
+        plain.convert_matrix_to_cnf(matrix, vector)
+        plain.write_cnf_header()
+        _, plain_clauses = self._read_clauses()
+
+        converter = CNFConverter(1, 2, 2, 1, self.output_file, preprocess=True)
+        converter.convert_matrix_to_cnf(matrix, vector)
+        converter.write_cnf_header()
+        header, clauses = self._read_clauses()
+
+        self.assertEqual(header, f"p cnf 2 {len(clauses)}")
+        self.assertLess(len(clauses), len(plain_clauses))
+        self.assertEqual(converter.preprocessor.fixed_assignments, {1: True, 2: True})
+        self.assertEqual(sorted(clauses), [(-1, -2), (1, 2)])
+
+    def test_incremental_family(self):
+        """测试增量实例族：每个变体的结果与穷举一致"""
+        rng = np.random.default_rng(5)
+        matrix = (rng.random((4, 6)) < 0.6).astype(int)
+        # m>1时错误比特块大于列数，重量约束必须作用在方程所用的列变量上
+        for m in (1, 3):
+            converter = CNFConverter(m, 4, 2, 2, self.output_file)
+            converter.convert_matrix_to_icnf(matrix, max_weight=3)
+            self.assertEqual(converter.variable_blocks[1], ('selector', 6 * m + 1, 4))
+
+            expected = []
+            for syndrome_bits in range(16):
+                syndrome = np.array([syndrome_bits >> i & 1 for i in range(4)])
+                for bound in (0, 1, 3):
+                    converter.add_variant(syndrome, bound)
+                    expected.append(any(
+                        np.array_equal(matrix.dot(e) % 2, syndrome) and e.sum() <= bound
+                        for e in (np.array([x >> i & 1 for i in range(6)]) for x in range(64))
+                    ))
+            self.assertEqual(converter.variant_count, 48)
+
+            num_vars, clauses, xors, variants = read_icnf(self.output_file)
+            solver = GF2Solver(num_vars, clauses, xors)
+            results = [solver.solve(assumptions=a).status == 'SAT' for a in variants]
+            self.assertEqual(results, expected)
+
+    def test_common_subexpression_elimination(self):
+        """测试公共子表达式消除后各行展开仍与原矩阵一致"""
+        rng = np.random.default_rng(3)
+        matrix = (rng.random((30, 12)) < 0.5).astype(np.uint8)
+        reduced, gates = eliminate_common_subexpressions(matrix)
+        self.assertGreater(len(gates), 0)
+
+        # 将门信号展开为输入集合
+        expansion = list(np.eye(12, dtype=np.uint8))
+        for a, b in gates:
+            expansion.append(expansion[a] ^ expansion[b])
+        expanded = reduced.astype(np.int64) @ np.array(expansion, dtype=np.int64) % 2
+        np.testing.assert_array_equal(expanded, matrix)
+        self.assertLess(reduced.sum() + 2 * len(gates), matrix.sum())
+
+    def test_field_multiplication(self):
+        """测试常数乘法与变量乘法电路对所有输入都与FieldMath一致"""
+        for cse in (False, True):
+            converter = CNFConverter(3, 4, 2, 2, self.output_file)
+            converter.clear_output_file()
+            x = converter.allocate_variables('symbol', 3) + np.arange(3)
+            y = converter.allocate_variables('symbol', 3) + np.arange(3)
+            product = converter.encode_variable_multiplication(x, y, cse=cse)
+            scaled = converter.encode_constant_multiplication(5, x, cse=cse)
+            converter.write_cnf_header()
+            _, clauses = self._read_clauses()
+            field = converter.field_math
+
+            for a in range(8):
+                for b in range(8):
+                    units = [[int(v) if value >> i & 1 else -int(v)]
+                             for value, variables in ((a, x), (b, y))
+                             for i, v in enumerate(variables)]
+                    model = GF2Solver(converter.variable_count, clauses + units).solve().model
+                    decode = lambda variables: sum(int(model[v]) << i for i, v in enumerate(variables))
+                    self.assertEqual(decode(product), field.gf_mul(a, b))
+                    self.assertEqual(decode(scaled), field.gf_mul(5, a))
+
+    def test_field_system(self):
+        """测试以消息符号为未知量的方程 y = u·G + e"""
+        rng = np.random.default_rng(7)
+        m, n, w, k = 3, 5, 1, 2
+        matrix = rng.integers(0, 8, (k, n + w))
+        converter = CNFConverter(m, n, w, k, self.output_file)
+        field = converter.field_math
+        message = np.array([3, 6])
+        error_vector = np.array([0, 0, 4, 0, 0, 0])
+        vector = np.array([
+            error_vector[j] ^ field.gf_mul(int(message[0]), int(matrix[0, j]))
+            ^ field.gf_mul(int(message[1]), int(matrix[1, j]))
+            for j in range(n + w)
+        ])
+
+        sizes = {}
+        for cse in (False, True):
+            converter.convert_field_system_to_cnf(matrix, vector, max_weight=1, cse=cse)
+            converter.write_cnf_header()
+            sizes[cse] = converter.clause_count
+            self.assertEqual(converter.variable_blocks[:2], [('error', 1, 18), ('symbol', 19, 6)])
+
+            # 重量为0的错误向量不满足方程时，唯一重量不超过1的解需与预置的消息一致
+            _, clauses = self._read_clauses()
+            solver = GF2Solver(converter.variable_count, clauses)
+            result = solver.solve()
+            self.assertEqual(result.status, 'SAT')
+            decode = lambda start, count: [
+                sum(int(result.model[start + i * m + b]) << b for b in range(m)) for i in range(count)]
+            recovered_error = np.array(decode(1, n + w))
+            recovered_message = np.array(decode(19, k))
+            self.assertLessEqual(np.count_nonzero(recovered_error), 1)
+            np.testing.assert_array_equal(
+                [recovered_error[j] ^ field.gf_mul(int(recovered_message[0]), int(matrix[0, j]))
+                 ^ field.gf_mul(int(recovered_message[1]), int(matrix[1, j])) for j in range(n + w)],
+                vector)
+        self.assertLess(sizes[True], sizes[False])
+
+
+class TestGF2Solver(unittest.TestCase):
+    def _brute_force(self, num_vars, clauses, xors):
+        """穷举判断可满足性"""
+        for bits in range(1 << num_vars):
+            value = lambda lit: bool(bits >> (abs(lit) - 1) & 1) == (lit > 0)
+            if all(any(value(l) for l in c) for c in clauses) and \
+                    all(sum(bits >> (v - 1) & 1 for v in vs) % 2 == rhs for vs, rhs in xors):
+                return True
+        return False
+
+    def test_random_instances(self):
+        """测试随机CNF+XOR实例与穷举结果一致"""
+        rng = np.random.default_rng(0)
+        for _ in range(60):
+            n = 8
+            clauses = [[int(v) * int(rng.choice([-1, 1]))
+                        for v in rng.choice(np.arange(1, n + 1), 3, replace=False)]
+                       for _ in range(int(rng.integers(5, 30)))]
+            xors = [([int(v) for v in rng.choice(np.arange(1, n + 1), 4, replace=False)],
+                     int(rng.integers(0, 2))) for _ in range(int(rng.integers(0, 5)))]
+            result = GF2Solver(n, clauses, xors).solve()
+            self.assertEqual(result.status == 'SAT', self._brute_force(n, clauses, xors))
+            if result.status == 'SAT':
+                model = result.model
+                self.assertTrue(all(any(model[abs(l)] == (l > 0) for l in c) for c in clauses))
+                self.assertTrue(all(sum(model[v] for v in vs) % 2 == rhs for vs, rhs in xors))
+
+    def test_verify_instance(self):
+        """测试端到端恢复预置错误向量"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            error_vector = np.array([0, 5, 0, 0, 3, 0])
+            bits = error_vector_to_bits(error_vector, 3).astype(int)
+            # 满秩的稀疏校验方程（上三角），包含超过4个变量的大型XOR
+            rng = np.random.default_rng(1)
+            matrix = np.eye(18, dtype=int) | np.triu(rng.random((18, 18)) < 0.2)
+            syndrome = matrix.dot(bits) % 2
+
+            for preprocess in (False, True):
+                converter = CNFConverter(3, 4, 2, 2, os.path.join(tmpdir, "v.cnf"),
+                                         preprocess=preprocess)
+                converter.convert_matrix_to_cnf(matrix, syndrome)
+                converter.write_cnf_header()
+                result = verify_instance(converter, error_vector)
+                self.assertEqual(result.status, 'SAT')
+                self.assertTrue(result.recovered)
+
+            # 不提供错误向量时只求解，不给出恢复结论
+            result = verify_instance(converter, None)
+            self.assertEqual(result.status, 'SAT')
+            self.assertIsNone(result.recovered)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+实例缓存模块测试
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.config import RLCEConfig
+from utils.instance_cache import InstanceCache
+
+
+class TestInstanceCache(unittest.TestCase):
+    def setUp(self):
+        """测试设置"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _make_file(self, name, size):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size))
+        return path
+
+    def test_key(self):
+        """测试缓存键只取决于影响实例内容的配置"""
+        base = RLCEConfig(seed=1)
+        self.assertEqual(InstanceCache.key(base),
+                         InstanceCache.key(RLCEConfig(seed=1, output_dir="other", cnf_file="x.cnf")))
+        self.assertNotEqual(InstanceCache.key(base), InstanceCache.key(RLCEConfig(seed=2)))
+        self.assertNotEqual(InstanceCache.key(base),
+                            InstanceCache.key(RLCEConfig(seed=1, preprocess=True)))
+
+    def test_store_and_restore(self):
+        """测试存储、命中与完整性校验"""
+        cache = InstanceCache(self.cache_dir)
+        source = self._make_file("a.cnf", 100)
+        cache.store("k1", {'cnf': source})
+
+        target = os.path.join(self.tmpdir.name, "restored.cnf")
+        self.assertTrue(cache.restore("k1", {'cnf': target}))
+        with open(source, 'rb') as f1, open(target, 'rb') as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertFalse(cache.restore("missing", {'cnf': target}))
+
+        # 篡改缓存文件后条目失效并被删除
+        with open(os.path.join(self.cache_dir, "k1", "cnf"), 'r+b') as f:
+            f.write(b'corrupt')
+        self.assertIsNone(cache.lookup("k1"))
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, "k1")))
+
+    def test_concurrent_store(self):
+        """测试并发写入同一键时后写入者复用已有条目"""
+        cache = InstanceCache(self.cache_dir)
+        other = InstanceCache(self.cache_dir)
+        source = self._make_file("a.cnf", 100)
+        cache.store("k1", {'cnf': source})
+        # 已有有效条目时直接返回
+        cache.store("k1", {'cnf': self._make_file("b.cnf", 50)})
+        self.assertEqual(cache.entries()["k1"]['files']['cnf']['size'], 100)
+
+        # 模拟另一进程在删除与重命名之间写入同一键
+        remove = cache.remove
+        def racing_remove(key):
+            remove(key)
+            other.store(key, {'cnf': source})
+        cache.remove = racing_remove
+        cache.store("k2", {'cnf': self._make_file("c.cnf", 50)})
+        self.assertIsNotNone(cache.lookup("k2"))
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["k1", "k2"])
+
+    def test_lru_eviction(self):
+        """测试按总大小进行最近最少使用淘汰"""
+        cache = InstanceCache(self.cache_dir, max_bytes=250)
+        cache.store("k1", {'cnf': self._make_file("1.cnf", 100)})
+        cache.store("k2", {'cnf': self._make_file("2.cnf", 100)})
+        self.assertIsNotNone(cache.lookup("k1"))  # k1成为最近使用
+        cache.store("k3", {'cnf': self._make_file("3.cnf", 100)})
+
+        self.assertEqual(sorted(cache.entries()), ["k1", "k3"])
+        self.assertLessEqual(cache.total_size(), 250)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -32,6 +32,16 @@ class TestRLCE(unittest.TestCase):
         with self.assertRaises(ValueError):
             invalid_config = RLCEConfig(n=5, k=10)  # n <= k
             invalid_config.validate()
+        
+        # 产物存储无法保存field编码的接收向量
+        with self.assertRaises(ValueError):
+            RLCEConfig(n=15, k=7, t=2, m=4, w=4, encoding="field", artifact_store="store").validate()
+        
+        # 增量变体不支持预处理，重量上界只对增量变体有效
+        with self.assertRaises(ValueError):
+            RLCEConfig(n=15, k=7, t=2, m=4, w=4, variants=2, preprocess=True).validate()
+        with self.assertRaises(ValueError):
+            RLCEConfig(n=15, k=7, t=2, m=4, w=4, weight_bounds=[1, 2]).validate()
     
     def test_field_math(self):
         """测试有限域数学运算"""
@@ -57,6 +67,29 @@ class TestRLCE(unittest.TestCase):
         public_key = self.rlce.generate_public_key()
         self.assertEqual(public_key.shape[0], self.config.k)
     
+    def test_deterministic_generation(self):
+        """测试相同(seed, instance_id)生成完全相同的实例"""
+        def generate(instance_id):
+            config = RLCEConfig(n=15, k=7, t=2, m=4, w=4, seed=2024, instance_id=instance_id)
+            rlce_rng, error_rng = config.spawn_generators(2)
+            rlce = RLCE(config.n, config.k, config.t, config.m, config.w, rng=rlce_rng)
+            error = ErrorGenerator(rng=error_rng).generate_weight_t_error(19, 2)
+            return rlce.generate_public_key(), error
+
+        pk1, e1 = generate(3)
+        generate(5)  # 其他实例的生成不影响结果
+        pk2, e2 = generate(3)
+        np.testing.assert_array_equal(pk1, pk2)
+        np.testing.assert_array_equal(e1, e2)
+
+        pk3, _ = generate(4)
+        self.assertFalse(np.array_equal(pk1, pk3))
+
+        # 未指定种子时记录系统熵以便复现
+        config = RLCEConfig()
+        config.spawn_generators()
+        self.assertIsNotNone(config.seed)
+
     def test_error_generator(self):
         """测试错误向量生成器"""
         error_gen = ErrorGenerator(seed=42)
@@ -71,6 +104,31 @@ class TestRLCE(unittest.TestCase):
         self.assertEqual(len(weight_error), 15)
         self.assertEqual(np.count_nonzero(weight_error), 5)
 
+    def test_batched_error_generator(self):
+        """测试批量错误向量生成"""
+        error_gen = ErrorGenerator(seed=42)
+
+        # 测试固定重量错误
+        errors = error_gen.generate_weight_t_errors(100, 19, 3, m=4)
+        self.assertEqual(errors.shape, (100, 19))
+        np.testing.assert_array_equal(np.count_nonzero(errors, axis=1), 3)
+        self.assertLess(errors.max(), 16)
+
+        # 测试随机错误
+        errors = error_gen.generate_random_errors(100, 10, 3, m=4)
+        weights = np.count_nonzero(errors, axis=1)
+        self.assertTrue(np.all((weights >= 1) & (weights <= 3)))
+
+        # 测试突发错误
+        errors = error_gen.generate_burst_errors(50, 10, 2, 4, m=4)
+        self.assertFalse(errors[:, :2].any())
+        self.assertFalse(errors[:, 6:].any())
+
+        # 相同种子结果一致
+        a = ErrorGenerator(seed=7).generate_weight_t_errors(5, 12, 2)
+        b = ErrorGenerator(seed=7).generate_weight_t_errors(5, 12, 2)
+        np.testing.assert_array_equal(a, b)
+
 
 class TestConfig(unittest.TestCase):
     def test_config_save_load(self):
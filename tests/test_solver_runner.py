@@ -0,0 +1,92 @@
+"""
+求解器运行模块测试
+"""
+
+import unittest
+import tempfile
+import time
+import numpy as np
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.solver_runner import (SolverRunner, SolverSpec, SolverInstance,
+                                 parse_solver_output, model_to_error_vector)
+
+
+class TestSolverRunner(unittest.TestCase):
+    def setUp(self):
+        """测试设置"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # 唯一解：x1=1, x2=0, x3=1, x4=1（m=2, 长度2 -> 错误向量[1, 3]）
+        self.cnf_file = os.path.join(self.tmpdir.name, "test.cnf")
+        with open(self.cnf_file, 'w') as f:
+            f.write("p cnf 4 4\n1 0\n-2 0\n3 0\n4 0\n")
+        self.unsat_file = os.path.join(self.tmpdir.name, "unsat.cnf")
+        with open(self.unsat_file, 'w') as f:
+            f.write("p cnf 1 2\n1 0\n-1 0\n")
+        self.sleeper = SolverSpec('sleeper', [sys.executable, '-c', 'import time; time.sleep(30)'])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_parse_output(self):
+        """测试求解器输出解析"""
+        status, model = parse_solver_output("c x\ns SATISFIABLE\nv 1 -2\nv 3 0\n", 10)
+        self.assertEqual(status, 'SAT')
+        self.assertEqual(model, [1, -2, 3])
+        self.assertEqual(parse_solver_output("", 20), ('UNSAT', None))
+        with self.assertRaises(ValueError):
+            parse_solver_output("s SATISFIABLE\nv 1 0\ns UNSATISFIABLE\n", 20)
+        np.testing.assert_array_equal(model_to_error_vector([1, -2, 3, 4], 2, 2), [1, 3])
+
+    def test_batch(self):
+        """测试并行批量求解"""
+        runner = SolverRunner([SolverSpec.builtin()], max_workers=2)
+        instances = [SolverInstance(self.cnf_file, 2, 2), self.unsat_file]
+        results = runner.run_batch(instances)
+        self.assertEqual([r.status for r in results], ['SAT', 'UNSAT'])
+        np.testing.assert_array_equal(results[0].error_vector, [1, 3])
+
+    def test_portfolio_kills_losers(self):
+        """测试竞速模式终止落后的求解器"""
+        runner = SolverRunner([self.sleeper, SolverSpec.builtin()])
+        start = time.time()
+        result = runner.run_portfolio(SolverInstance(self.cnf_file, 2, 2))
+        self.assertEqual(result.solver, 'builtin')
+        self.assertEqual(result.status, 'SAT')
+        self.assertLess(time.time() - start, 20)
+
+    @unittest.skipIf(sys.platform == 'win32', "Windows下不支持内存限制")
+    def test_memory_limit(self):
+        """测试内存上限在并行批量求解中生效"""
+        hog = SolverSpec('hog', [sys.executable, '-c', 'bytearray(2 << 30)'])
+        runner = SolverRunner([hog], memory_limit=256, max_workers=2)
+        results = runner.run_batch([self.cnf_file, self.cnf_file])
+        self.assertTrue(all(r.returncode != 0 for r in results))
+        self.assertTrue(all('MemoryError' in r.output for r in results))
+
+        runner = SolverRunner([SolverSpec.builtin()], memory_limit=1024, max_workers=2)
+        results = runner.run_batch([SolverInstance(self.cnf_file, 2, 2), self.unsat_file])
+        self.assertEqual([r.status for r in results], ['SAT', 'UNSAT'])
+
+    def test_rejects_incremental(self):
+        """测试拒绝iCNF实例，避免合并多个变体的模型"""
+        icnf_file = os.path.join(self.tmpdir.name, "family.cnf")
+        with open(icnf_file, 'w') as f:
+            f.write("p inccnf\n1 2 0\na 1 0\na -1 0\n")
+        runner = SolverRunner([SolverSpec.builtin()])
+        with self.assertRaises(ValueError):
+            runner.run_instance(icnf_file)
+
+    def test_timeout(self):
+        """测试时间上限"""
+        runner = SolverRunner([self.sleeper], time_limit=0.2)
+        result = runner.run_instance(self.cnf_file)
+        self.assertEqual(result.status, 'TIMEOUT')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+变量映射模块测试
+"""
+
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.cnf_converter import CNFConverter
+from core.gf2_solver import error_vector_to_bits
+from utils.variable_map import VariableMap
+from utils.solver_runner import SolverRunner, SolverSpec, VARIABLE_MAP_SUFFIX
+
+
+class TestVariableMap(unittest.TestCase):
+    def setUp(self):
+        """测试设置"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cnf_file = os.path.join(self.tmpdir.name, "test.cnf")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_decode_default_layout(self):
+        """测试默认布局下的模型解码"""
+        vmap = VariableMap(3, 2)
+        # 错误向量[5, 2] -> 比特 101 010
+        np.testing.assert_array_equal(vmap.decode([1, -2, 3, -4, 5, -6]), [5, 2])
+        np.testing.assert_array_equal(vmap.decode_output("s SATISFIABLE\nv 1 -2 3\nv -4 5 -6 0\n"),
+                                      [5, 2])
+
+    def test_save_load(self):
+        """测试边车文件读写"""
+        blocks = [('error', 1, 6), ('auxiliary', 7, 3), ('cardinality', 10, 4)]
+        path = os.path.join(self.tmpdir.name, "test.vmap")
+        VariableMap(3, 2, 13, blocks).save(path)
+        loaded = VariableMap.load(path)
+        self.assertEqual((loaded.m, loaded.length, loaded.num_vars), (3, 2, 13))
+        self.assertEqual(loaded.blocks, blocks)
+        self.assertEqual(loaded.block('auxiliary'), [(7, 3)])
+
+        # 域编码的消息符号块
+        vmap = VariableMap(3, 2, 12, [('error', 1, 6), ('symbol', 7, 6)])
+        vmap.save(path)
+        model = [-1, -2, -3, -4, -5, -6, 7, 8, -9, -10, -11, 12]
+        np.testing.assert_array_equal(VariableMap.load(path).decode(model, kind='symbol'), [3, 4])
+
+    def test_preprocessed_round_trip(self):
+        """测试预处理实例经求解器和边车文件还原错误向量"""
+        error_vector = np.array([0, 5, 0, 0, 3, 0])
+        bits = error_vector_to_bits(error_vector, 3).astype(int)
+        rng = np.random.default_rng(3)
+        matrix = np.eye(18, dtype=int) | np.triu(rng.random((18, 18)) < 0.3)
+        converter = CNFConverter(3, 4, 2, 2, self.cnf_file, preprocess=True)
+        converter.convert_matrix_to_cnf(matrix, matrix.dot(bits) % 2)
+        converter.write_cnf_header()
+        VariableMap.from_converter(converter).save(self.cnf_file + VARIABLE_MAP_SUFFIX)
+
+        result = SolverRunner([SolverSpec.builtin()]).run_instance(self.cnf_file)
+        self.assertEqual(result.status, 'SAT')
+        np.testing.assert_array_equal(result.error_vector, error_vector)
+
+
+if __name__ == '__main__':
+    unittest.main()